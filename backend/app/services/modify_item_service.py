@@ -22,10 +22,25 @@ logger = logging.getLogger(__name__)
 class ModifyItemService:
     """Enhanced service for validating and applying complex item modifications to Redis orders"""
     
-    def __init__(self, menu_service: MenuService = None, ingredient_service: IngredientService = None):
-        """Initialize the service with dependencies"""
+    def __init__(
+        self,
+        menu_service: MenuService = None,
+        ingredient_service: IngredientService = None,
+        menu_cache: Optional[Dict[int, Any]] = None,
+        ingredient_cache: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the service with dependencies
+        
+        Args:
+            menu_cache: Optional preloaded menu items by id; quantity validation reads it instead of the database
+            ingredient_cache: Optional preloaded ingredients of the order's restaurant by lowercased name;
+                ingredient validation reads it instead of searching the database
+        """
         self.menu_service = menu_service or MenuService()
         self.ingredient_service = ingredient_service or IngredientService()
+        self.menu_cache = menu_cache
+        self.ingredient_cache = ingredient_cache
     
     async def apply_modification(self, agent_result: ModifyItemResult, redis_order: Dict[str, Any]) -> ModifyItemResultDto:
         """
@@ -150,9 +165,12 @@ class ModifyItemService:
             return "Restaurant ID not found in order"
         
         try:
-            # Get menu item details from database
-            from app.models.menu_item import MenuItem
-            menu_item = await MenuItem.get_or_none(id=menu_item_id)
+            if self.menu_cache is not None:
+                menu_item = self.menu_cache.get(menu_item_id)
+            else:
+                # Get menu item details from database
+                from app.models.menu_item import MenuItem
+                menu_item = await MenuItem.get_or_none(id=menu_item_id)
             if not menu_item:
                 return f"Menu item {menu_item_id} not found"
             
@@ -188,7 +206,11 @@ class ModifyItemService:
                 # Extract ingredient name from modification (e.g., "extra cheese" -> "cheese")
                 ingredient_name = self._extract_ingredient_name(ingredient_mod)
                 
-                if ingredient_name:
+                if ingredient_name and self.ingredient_cache is not None:
+                    # Same case-insensitive substring match as search_by_name
+                    if not any(ingredient_name in name for name in self.ingredient_cache):
+                        return f"'{ingredient_name}' is not available at this restaurant"
+                elif ingredient_name:
                     # Use fuzzy search like MenuResolutionService does
                     ingredient_matches = await self.ingredient_service.search_by_name(
                         restaurant_id=restaurant_id,
@@ -418,6 +440,7 @@ class ModifyItemService:
         
         # Apply ingredient modifications and calculate cost
         if parsed_mods["ingredient_modifications"]:
+            # Already lowercase (parsed from the lowercased text), so readers can match it without .lower()
             item["modifications"]["ingredient_modifications"] = "; ".join(parsed_mods["ingredient_modifications"])
             # Calculate cost for ingredient modifications
             ingredient_cost = await self._calculate_ingredient_cost(parsed_mods["ingredient_modifications"], item)
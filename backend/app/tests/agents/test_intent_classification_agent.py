@@ -0,0 +1,155 @@
+"""
+Unit tests for Intent Classification Agent
+
+The LLM is replaced by a dict-lookup stub keyed on the user input, so these
+run in-process without network access. Live classification quality is covered
+by the integration tier (integration/test_intent_classification_agent_integration.py).
+"""
+
+import re
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.workflow.agents.intent_classification_agent import (
+    intent_classification_agent,
+    intent_classification_agent_batch
+)
+from app.workflow.response.intent_classification_response import (
+    IntentClassificationResult,
+    IntentClassificationBatchResult
+)
+from app.constants.intent_types import IntentType
+from app.dto.conversation_dto import ConversationHistory, ConversationRole
+
+
+# Canned classifications keyed by lowercased user input
+_CANNED_RESULTS = {
+    "i want a burger": IntentClassificationResult(
+        intent=IntentType.ADD_ITEM, confidence=0.95, reasoning="Ordering a menu item"
+    ),
+    "remove my fries": IntentClassificationResult(
+        intent=IntentType.REMOVE_ITEM, confidence=0.9, reasoning="Removing an item from the order"
+    ),
+    "clear my order": IntentClassificationResult(
+        intent=IntentType.CLEAR_ORDER, confidence=0.9, reasoning="Clearing the whole order"
+    ),
+    "no pickles on the burger": IntentClassificationResult(
+        intent=IntentType.MODIFY_ITEM, confidence=0.9, reasoning="Modifying an existing item"
+    ),
+    "that's all": IntentClassificationResult(
+        intent=IntentType.CONFIRM_ORDER, confidence=0.95, reasoning="Ordering is complete"
+    ),
+    "how much is a burger?": IntentClassificationResult(
+        intent=IntentType.QUESTION, confidence=0.9, reasoning="Question about pricing"
+    ),
+}
+
+_UNKNOWN_RESULT = IntentClassificationResult(
+    intent=IntentType.UNKNOWN, confidence=0.2, reasoning="No canned classification"
+)
+
+
+def _lookup(prompt):
+    """Return the canned result for the USER INPUT line of the prompt"""
+    user_input = re.search(r'USER INPUT: "(.*)"', prompt).group(1)
+    return _CANNED_RESULTS.get(user_input.lower(), _UNKNOWN_RESULT)
+
+
+class TestIntentClassificationAgent:
+    """Tests for intent classification agent"""
+
+    @pytest.fixture
+    def stub_llm(self):
+        """Replace the agent's LLM with the dict-lookup stub"""
+        mock_llm = Mock()
+        mock_llm.ainvoke = AsyncMock(side_effect=_lookup)
+        with patch('app.workflow.agents.intent_classification_agent._get_llm', return_value=mock_llm):
+            yield mock_llm
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("user_input", list(_CANNED_RESULTS))
+    async def test_returns_llm_classification(self, stub_llm, user_input):
+        """Test the structured LLM result is returned unchanged"""
+        result = await intent_classification_agent(
+            user_input=user_input,
+            conversation_history=ConversationHistory(session_id="test_session"),
+            order_items=[]
+        )
+
+        assert result == _CANNED_RESULTS[user_input]
+        stub_llm.ainvoke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_defaults_missing_context(self, stub_llm):
+        """Test history and order items are optional"""
+        result = await intent_classification_agent(user_input="I want a burger")
+
+        assert result.intent == IntentType.ADD_ITEM
+        prompt = stub_llm.ainvoke.await_args.args[0]
+        assert "Order items (already in cart): []" in prompt
+
+    @pytest.mark.asyncio
+    async def test_prompt_includes_history_without_timestamps(self, stub_llm):
+        """Test history is rendered as role/content pairs only"""
+        history = ConversationHistory(session_id="test_session")
+        history.add_entry(ConversationRole.USER, "I want a burger")
+        history.add_entry(ConversationRole.ASSISTANT, "Added burger to your order")
+
+        await intent_classification_agent(
+            user_input="That's all",
+            conversation_history=history,
+            order_items=[{"name": "burger", "quantity": 1}]
+        )
+
+        prompt = stub_llm.ainvoke.await_args.args[0]
+        assert "user: I want a burger" in prompt
+        assert "assistant: Added burger to your order" in prompt
+        assert "timestamp" not in prompt
+        assert "{'name': 'burger', 'quantity': 1}" in prompt
+
+    @pytest.mark.asyncio
+    async def test_llm_error_falls_back_to_unknown(self, stub_llm):
+        """Test LLM failures degrade to a low confidence UNKNOWN"""
+        stub_llm.ainvoke.side_effect = Exception("API error")
+
+        result = await intent_classification_agent(user_input="I want a burger")
+
+        assert result.intent == IntentType.UNKNOWN
+        assert result.confidence == 0.1
+        assert result.reasoning == "Classification failed: API error"
+        assert not result.is_actionable()
+
+    @pytest.mark.asyncio
+    async def test_batch_returns_results_in_input_order(self, stub_llm):
+        """Test a batch is classified by one call sharing the context"""
+        user_inputs = ["I want a burger", "That's all", "How much is a burger?"]
+        batch = IntentClassificationBatchResult(
+            results=[_CANNED_RESULTS[user_input.lower()] for user_input in user_inputs]
+        )
+        mock_batch_llm = Mock()
+        mock_batch_llm.ainvoke = AsyncMock(return_value=batch)
+
+        with patch('app.workflow.agents.intent_classification_agent._get_batch_llm', return_value=mock_batch_llm):
+            results = await intent_classification_agent_batch(user_inputs, order_items=[])
+
+        assert [result.intent for result in results] == [
+            IntentType.ADD_ITEM, IntentType.CONFIRM_ORDER, IntentType.QUESTION
+        ]
+        prompt = mock_batch_llm.ainvoke.await_args.args[0]
+        assert '2. "That\'s all"' in prompt
+        stub_llm.ainvoke.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_falls_back_on_result_count_mismatch(self, stub_llm):
+        """Test each input is classified separately if the batch comes back short"""
+        user_inputs = ["I want a burger", "Remove my fries"]
+        mock_batch_llm = Mock()
+        mock_batch_llm.ainvoke = AsyncMock(
+            return_value=IntentClassificationBatchResult(results=[_CANNED_RESULTS["i want a burger"]])
+        )
+
+        with patch('app.workflow.agents.intent_classification_agent._get_batch_llm', return_value=mock_batch_llm):
+            results = await intent_classification_agent_batch(user_inputs)
+
+        assert [result.intent for result in results] == [IntentType.ADD_ITEM, IntentType.REMOVE_ITEM]
+        assert stub_llm.ainvoke.await_count == 2
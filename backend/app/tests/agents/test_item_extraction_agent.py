@@ -0,0 +1,78 @@
+"""
+Unit tests for Item Extraction Agent batching
+
+The LLM is mocked, so these run in-process without network access. Live
+extraction quality is covered by integration/test_item_extraction_agent_integration.py.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.workflow.agents.item_extraction_agent import item_extraction_agent_batch
+from app.workflow.response.item_extraction_response import (
+    ExtractedItem,
+    ItemExtractionResponse,
+    ItemExtractionBatchResponse
+)
+
+
+def _extraction(item_name, quantity):
+    """Build a successful single-item extraction"""
+    return ItemExtractionResponse(
+        success=True,
+        confidence=0.9,
+        extracted_items=[ExtractedItem(item_name=item_name, quantity=quantity, confidence=0.9)]
+    )
+
+
+_EMPTY_CONTEXT = {"conversation_history": [], "order_state": {}, "restaurant_id": "1"}
+
+
+class TestItemExtractionAgentBatch:
+    """Tests for the batched item extraction agent"""
+
+    @pytest.fixture
+    def mock_llm(self):
+        """Replace the agent's single and batch LLMs with one mock runnable"""
+        llm = Mock()
+        llm.ainvoke = AsyncMock()
+        with patch('app.workflow.agents.item_extraction_agent._get_llm', return_value=llm), \
+                patch('app.workflow.agents.item_extraction_agent._get_batch_llm', return_value=llm):
+            yield llm
+
+    @pytest.mark.asyncio
+    async def test_batch_returns_results_in_input_order(self, mock_llm):
+        """Test every input is extracted by one call sharing the context"""
+        mock_llm.ainvoke.return_value = ItemExtractionBatchResponse(
+            results=[_extraction("burger", 1), _extraction("burger", 2)]
+        )
+
+        results = await item_extraction_agent_batch(["I want a burger", "Give me two burgers"], _EMPTY_CONTEXT)
+
+        assert [result.extracted_items[0].quantity for result in results] == [1, 2]
+        mock_llm.ainvoke.assert_awaited_once()
+        prompt = mock_llm.ainvoke.await_args.args[0]
+        assert '["I want a burger", "Give me two burgers"]' in prompt
+
+    @pytest.mark.asyncio
+    async def test_batch_falls_back_on_result_count_mismatch(self, mock_llm):
+        """Test each input is extracted separately if the batch comes back short"""
+        mock_llm.ainvoke.side_effect = [
+            ItemExtractionBatchResponse(results=[_extraction("burger", 1)]),
+            _extraction("burger", 1),
+            _extraction("fries", 1),
+        ]
+
+        results = await item_extraction_agent_batch(["I want a burger", "And fries"], _EMPTY_CONTEXT)
+
+        assert [result.extracted_items[0].item_name for result in results] == ["burger", "fries"]
+        assert mock_llm.ainvoke.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_error_returns_error_response_per_input(self, mock_llm):
+        """Test LLM failures produce one unsuccessful response per input"""
+        mock_llm.ainvoke.side_effect = Exception("API error")
+
+        results = await item_extraction_agent_batch(["I want a burger", "And fries"], _EMPTY_CONTEXT)
+
+        assert len(results) == 2
+        assert all(not result.success and result.needs_clarification for result in results)
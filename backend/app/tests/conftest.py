@@ -4,6 +4,11 @@ Pytest configuration and fixtures
 Auto-discovered by pytest for all tests.
 """
 
+import asyncio
+import os
+
+import pytest
+
 # Import all fixtures from fixtures module
 from app.tests.fixtures.database_fixtures import (
     test_db,
@@ -13,13 +18,108 @@ from app.tests.fixtures.database_fixtures import (
     test_menu_items,
     test_services
 )
+from app.tests.fixtures.llm_cache_fixtures import (
+    LLM_CACHE_MODE,
+    context_agent_cache,
+    structured_agent_cache,
+    module_structured_agent_cache,
+    intent_classification_cache
+)
+from app.tests.fixtures.agent_fixtures import context_agent, resolve_contexts_concurrently, gather_llm_calls
 
 __all__ = [
     "test_db",
-    "test_restaurant", 
+    "test_restaurant",
     "test_categories",
     "test_ingredients",
     "test_menu_items",
-    "test_services"
+    "test_services",
+    "context_agent_cache",
+    "structured_agent_cache",
+    "module_structured_agent_cache",
+    "intent_classification_cache",
+    "context_agent",
+    "resolve_contexts_concurrently",
+    "gather_llm_calls"
 ]
 
+
+def _openai_key() -> str:
+    """Return the OpenAI key, reading .env through settings only if the env var is unset"""
+    key = os.environ.get("OPENAI_API_KEY")
+    if key is None:
+        from app.config.settings import settings
+        key = settings.openai_api_key
+    return key or ""
+
+
+def _openai_key_configured() -> bool:
+    """Check for a usable OpenAI key"""
+    key = _openai_key()
+    return bool(key) and key != "your-openai-api-key-here"
+
+
+def _needs_live_openai(item) -> bool:
+    """requires_openai tests need the API unless they replay every call from recordings (LLM_CACHE_MODE=once)"""
+    if item.get_closest_marker("requires_openai") is None:
+        return False
+    return not (LLM_CACHE_MODE == "once" and item.get_closest_marker("llm_replayable"))
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked requires_openai when no OpenAI API key is configured"""
+    marked = [item for item in items if _needs_live_openai(item)]
+    if not marked or _openai_key_configured():
+        return
+
+    skip = pytest.mark.skip(reason="OpenAI API key not configured")
+    for item in marked:
+        item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def openai_reachable():
+    """
+    Probe the OpenAI API once per session.
+
+    Any HTTP response counts as reachable; only connection-level failures
+    (DNS, TLS, timeouts) mark it as down.
+    """
+    import httpx
+
+    try:
+        httpx.get(
+            "https://api.openai.com/v1/models",
+            headers={"Authorization": f"Bearer {_openai_key()}"},
+            timeout=2.0
+        )
+    except httpx.TransportError:
+        return False
+    return True
+
+
+@pytest.fixture(autouse=True)
+def skip_if_openai_unreachable(request):
+    """Skip requires_openai tests when the OpenAI API can't be reached"""
+    if not _needs_live_openai(request.node):
+        return
+    if not request.getfixturevalue("openai_reachable"):
+        pytest.skip("OpenAI API unreachable")
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """
+    Run async tests on uvloop where it is available (it ships with uvicorn[standard]),
+    which cuts per-await overhead when many LLM calls are in flight at once.
+    
+    Set PYTEST_EVENT_LOOP=asyncio to run on the stock loop, e.g. to compare timings
+    or to rule uvloop out when debugging.
+    """
+    if os.environ.get("PYTEST_EVENT_LOOP") == "asyncio":
+        return asyncio.DefaultEventLoopPolicy()
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
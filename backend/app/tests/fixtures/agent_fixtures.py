@@ -0,0 +1,63 @@
+"""
+Shared agent fixtures for integration tests
+
+Agents are stateless between calls, so one instance (and its LLM client's
+connection pool) is shared by every test in the session.
+"""
+
+import asyncio
+import os
+
+import pytest
+from app.workflow.agents.context_agent import ContextAgent
+
+# Upper bound on in-flight LLM requests across the session, to stay under rate limits
+_MAX_CONCURRENT_REQUESTS = int(os.environ.get("DRIVETHRU_LLM_CONCURRENCY", "10"))
+
+
+@pytest.fixture(scope="session")
+def context_agent():
+    """
+    Create one ContextAgent instance for the whole test session
+
+    The agent keeps the LLM client it builds on first use, with the API key
+    settings held at that moment, so tests that monkeypatch settings must
+    override this fixture with their own agent.
+    """
+    return ContextAgent()
+
+
+@pytest.fixture(scope="session")
+def resolve_contexts_concurrently(context_agent):
+    """
+    Resolve several context requests in one gather so their LLM round-trips
+    overlap instead of being awaited one after another.
+
+    Takes a list of resolve_context keyword-argument dicts and returns the
+    results in the same order.
+    """
+    async def resolve(requests):
+        return await asyncio.gather(
+            *[context_agent.resolve_context(**kwargs) for kwargs in requests]
+        )
+    return resolve
+
+
+@pytest.fixture(scope="session")
+def gather_llm_calls():
+    """
+    Await several independent LLM calls concurrently.
+
+    Takes a list of coroutines and returns their results in the same order.
+    At most DRIVETHRU_LLM_CONCURRENCY (default 10) are in flight at once,
+    across every test in the session.
+    """
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    async def gather(coros):
+        return await asyncio.gather(*[bounded(coro) for coro in coros])
+    return gather
@@ -0,0 +1,350 @@
+"""
+Disk cache for live LLM calls made by integration tests
+
+Responses are keyed by a sha256 of the model name and the exact prompt text and
+stored under app/tests/integration/_llm_cache/, so repeated runs (including CI)
+replay them instead of calling OpenAI. LLM_CACHE_MODE is read once per session:
+
+    replay  (default) serve stored responses, call and store on a miss
+    once    serve stored responses and fail the test on a miss, for CI runs
+            that must never reach the API
+    record  always call the LLM and overwrite the stored response
+    bypass  never read or write the cache
+
+Structured-output agents (item extraction, modify item) are cached as validated
+results under a sha256 of the model, temperature, seed, max_tokens, response schema and the
+NFC-normalized, whitespace-collapsed messages, serialized with sorted keys so
+equivalent requests always hash the same.
+
+Intent classifications use the same key, computed from the prompt the agent
+renders and the model settings it resolves. They are stored as structured
+results in a single JSONL file (intent_classifications.jsonl, one {"key",
+"result"} record per line, later lines winning) that is loaded once per
+session, and are also memoized in memory since the same utterances are
+classified by many tests.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+from langchain_openai import ChatOpenAI
+from app.config.settings import settings
+from app.dto.conversation_dto import ConversationHistory
+from app.tests.fixtures.llm_cache_keys import CACHE_DIR, DETERMINISTIC_LLM_OPTIONS, structured_cache_key, structured_cache_path
+from app.workflow.agents.context_agent import ContextAgent
+from app.workflow.agents.intent_classification_agent import _build_context, _llm_config, intent_classification_agent
+from app.workflow.prompts.intent_classification_prompts import get_intent_classification_prompt
+from app.workflow.response.intent_classification_response import IntentClassificationResult
+from app.workflow.response.item_extraction_response import ItemExtractionResponse, ItemExtractionBatchResponse
+from app.workflow.response.modify_item_response import ModifyItemResult
+
+LLM_CACHE_MODE = os.environ.get("LLM_CACHE_MODE", "replay")
+_REPLAYING = LLM_CACHE_MODE in ("replay", "once")
+INTENT_CACHE_FILE = CACHE_DIR / "intent_classifications.jsonl"
+
+# Models for the tests that call the LLM directly rather than through an agent
+MODIFY_ITEM_TEST_MODEL = os.environ.get("MODIFY_ITEM_TEST_MODEL", "gpt-4o-mini")
+INTENT_CLASSIFICATION_TEST_MODEL = os.environ.get("INTENT_CLASSIFICATION_TEST_MODEL", "gpt-4o-mini")
+
+# (agent module, LLM getter, response schema) for each structured-output call the cache stands in for.
+# Modules are imported by path: the agents package re-exports functions under the same names.
+STRUCTURED_AGENT_LLMS = [
+    ("app.workflow.agents.item_extraction_agent", "_get_llm", ItemExtractionResponse),
+    ("app.workflow.agents.item_extraction_agent", "_get_batch_llm", ItemExtractionBatchResponse),
+    ("app.workflow.agents.modify_item_agent", "_get_llm", ModifyItemResult),
+]
+
+
+def _require_recording(what: str) -> None:
+    """Fail the test instead of calling the LLM when a recording is missing in once mode"""
+    # pytest.fail is not an Exception, so the agents' error fallbacks can't swallow it
+    if LLM_CACHE_MODE == "once":
+        pytest.fail(f"No recorded LLM response for {what} (LLM_CACHE_MODE=once)")
+
+
+def _prompt_text(prompt) -> str:
+    """Flatten a prompt string or message list into the text that was sent"""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n".join(message.content for message in prompt)
+
+
+def _cache_path(llm, prompt) -> Path:
+    key = hashlib.sha256(f"{llm.model_name}\n{_prompt_text(prompt)}".encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+class _CachedMessage(BaseModel):
+    """On-disk form of a raw chat response, (de)serialized by pydantic-core rather than the json module"""
+    content: str
+
+
+class CachedChatModel:
+    """Wraps a chat model so invoke/ainvoke/abatch replay responses from the disk cache"""
+
+    def __init__(self, llm):
+        self._llm = llm
+
+    def _load(self, path: Path):
+        if _REPLAYING and path.exists():
+            return AIMessage(content=_CachedMessage.model_validate_json(path.read_bytes()).content)
+        _require_recording(path.name)
+        return None
+
+    def _store(self, path: Path, response) -> None:
+        if LLM_CACHE_MODE != "bypass":
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            path.write_text(_CachedMessage(content=response.content).model_dump_json())
+
+    def invoke(self, prompt, **kwargs):
+        path = _cache_path(self._llm, prompt)
+        cached = self._load(path)
+        if cached is not None:
+            return cached
+        response = self._llm.invoke(prompt, **kwargs)
+        self._store(path, response)
+        return response
+
+    async def ainvoke(self, prompt, **kwargs):
+        path = _cache_path(self._llm, prompt)
+        cached = self._load(path)
+        if cached is not None:
+            return cached
+        response = await self._llm.ainvoke(prompt, **kwargs)
+        self._store(path, response)
+        return response
+
+    async def abatch(self, prompts, **kwargs):
+        """Resolve each prompt through the cache concurrently"""
+        return await asyncio.gather(*[self.ainvoke(prompt, **kwargs) for prompt in prompts])
+
+    async def astream(self, prompt, **kwargs):
+        """Stream chunks; a cache hit arrives as one chunk, and a stream the caller abandons is not stored"""
+        path = _cache_path(self._llm, prompt)
+        cached = self._load(path)
+        if cached is not None:
+            yield cached
+            return
+        content = []
+        async for chunk in self._llm.astream(prompt, **kwargs):
+            content.append(chunk.content)
+            yield chunk
+        self._store(path, AIMessage(content="".join(content)))
+
+
+def cached_invoke(llm, prompt):
+    """Invoke `llm` with `prompt`, going through the disk cache"""
+    return CachedChatModel(llm).invoke(prompt)
+
+
+async def cached_ainvoke(llm, prompt):
+    """Async variant of cached_invoke"""
+    return await CachedChatModel(llm).ainvoke(prompt)
+
+
+def cached_astream(llm, prompt):
+    """Streaming variant of cached_invoke"""
+    return CachedChatModel(llm).astream(prompt)
+
+
+@pytest.fixture(autouse=True)
+def context_agent_cache(request, monkeypatch):
+    """
+    Route ContextAgent's LLM calls through the disk cache.
+
+    Tests that use the openai_mock fixture are left alone so their canned
+    responses are always served by the mock.
+    """
+    if "openai_mock" in request.fixturenames or LLM_CACHE_MODE == "bypass":
+        yield
+        return
+
+    original = ContextAgent._get_llm
+    monkeypatch.setattr(ContextAgent, "_get_llm", lambda self: CachedChatModel(original(self)))
+    yield
+
+
+class CachedStructuredModel:
+    """Wraps a structured-output runnable so ainvoke replays validated results from the disk cache"""
+
+    def __init__(self, runnable, llm, schema):
+        self._runnable = runnable
+        self._llm = llm
+        self._schema = schema
+
+    async def ainvoke(self, prompt, **kwargs):
+        path = structured_cache_path(self._llm, self._schema, prompt)
+        if _REPLAYING and path.exists():
+            return self._schema.model_validate_json(path.read_bytes())
+        _require_recording(path.name)
+        result = await self._runnable.ainvoke(prompt, **kwargs)
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text(result.model_dump_json())
+        return result
+
+
+@lru_cache(maxsize=None)
+def _shared_http_client() -> httpx.AsyncClient:
+    """
+    One connection pool for every cached chat model, so concurrent agent calls reuse
+    warm TLS connections; multiplexed over HTTP/2 when h2 (httpx[http2]) is installed.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+    )
+
+
+@lru_cache(maxsize=None)
+def deterministic_chat_model(model: str, json_mode: bool = False) -> ChatOpenAI:
+    """
+    One chat model per model (and response format) for the whole session,
+    sampling pinned by DETERMINISTIC_LLM_OPTIONS.
+
+    Also used by tests that call the LLM directly through cached_ainvoke or
+    cached_astream, which then replay without an API key in LLM_CACHE_MODE=once.
+    """
+    api_key = settings.openai_api_key
+    if LLM_CACHE_MODE == "once" and not api_key:
+        # Never sent: a miss fails the test before the client makes a request
+        api_key = "replay-only"
+    model_kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+    return ChatOpenAI(
+        model=model,
+        api_key=api_key,
+        http_async_client=_shared_http_client(),
+        model_kwargs=model_kwargs,
+        **DETERMINISTIC_LLM_OPTIONS
+    )
+
+
+@lru_cache(maxsize=None)
+def _cached_structured_llm(model: str, schema):
+    """Structured-output runnable for `schema` on the shared chat model, going through the disk cache"""
+    llm = deterministic_chat_model(model)
+    return CachedStructuredModel(llm.with_structured_output(schema, method="function_calling"), llm, schema)
+
+
+def _patch_structured_agents(monkeypatch) -> None:
+    """Point every structured agent LLM getter at its cached, deterministic replacement"""
+    for module_name, getter, schema in STRUCTURED_AGENT_LLMS:
+        module = importlib.import_module(module_name)
+        monkeypatch.setattr(
+            module, getter,
+            lambda model=module._MODEL, schema=schema: _cached_structured_llm(model, schema)
+        )
+
+
+@pytest.fixture(autouse=True)
+def structured_agent_cache(request, monkeypatch):
+    """
+    Route the item extraction and modify item agents' LLM calls through the disk cache,
+    sampling greedily with a fixed seed so re-recorded responses stay reproducible.
+
+    Tests that use the openai_mock fixture are left alone so their canned
+    responses are always served by the mock.
+    """
+    if "openai_mock" in request.fixturenames or LLM_CACHE_MODE == "bypass":
+        yield
+        return
+
+    _patch_structured_agents(monkeypatch)
+    yield
+
+
+@pytest.fixture(scope="module")
+def module_structured_agent_cache():
+    """
+    structured_agent_cache for module-scoped fixtures that call the agents.
+
+    Module-scoped fixtures are set up before any function-scoped autouse fixture,
+    so they must request this one to have their calls go through the disk cache.
+    """
+    if LLM_CACHE_MODE == "bypass":
+        yield
+        return
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        _patch_structured_agents(monkeypatch)
+        yield
+
+
+def _intent_cache_key(user_input, conversation_history, order_items, llm_options) -> str:
+    """Hash the prompt the agent renders and the model settings it resolves, as the structured agent cache does"""
+    model, temperature, max_tokens = _llm_config(
+        llm_options.get("model"), llm_options.get("temperature"), llm_options.get("max_tokens")
+    )
+    if conversation_history is None:
+        conversation_history = ConversationHistory(session_id="")
+    context = _build_context(user_input, conversation_history, order_items or [])
+    prompt = get_intent_classification_prompt(user_input, context)
+    return structured_cache_key(model, temperature, None, max_tokens, IntentClassificationResult, prompt)
+
+
+class _IntentCacheRecord(BaseModel):
+    """One intent_classifications.jsonl line, parsed straight into the result model by pydantic-core"""
+    key: str
+    result: IntentClassificationResult
+
+
+def _load_intent_cache() -> dict:
+    """Read the recorded intent classifications, or nothing unless replaying"""
+    if not _REPLAYING or not INTENT_CACHE_FILE.exists():
+        return {}
+    cache = {}
+    with INTENT_CACHE_FILE.open() as f:
+        for line in f:
+            if line.strip():
+                record = _IntentCacheRecord.model_validate_json(line)
+                cache[record.key] = record.result
+    return cache
+
+
+def _store_intent_result(key: str, result) -> None:
+    if LLM_CACHE_MODE != "bypass":
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with INTENT_CACHE_FILE.open("a") as f:
+            f.write(_IntentCacheRecord(key=key, result=result).model_dump_json() + "\n")
+
+
+@pytest.fixture(scope="session")
+def intent_classification_cache():
+    """
+    Drop-in replacement for intent_classification_agent that replays recorded
+    results from disk and memoizes them for the whole session.
+
+    Fallback results from a failed call are not stored, so a transient API
+    error isn't replayed into later tests.
+    """
+    cache = _load_intent_cache()
+
+    async def classify(user_input, conversation_history=None, order_items=None, **llm_options):
+        key = _intent_cache_key(user_input, conversation_history, order_items, llm_options)
+        if key not in cache:
+            _require_recording(f"intent classification {key}")
+            result = await intent_classification_agent(
+                user_input=user_input,
+                conversation_history=conversation_history,
+                order_items=order_items,
+                **llm_options
+            )
+            if (result.reasoning or "").startswith("Classification failed"):
+                return result
+            cache[key] = result
+            _store_intent_result(key, result)
+        return cache[key]
+
+    return classify
@@ -0,0 +1,52 @@
+"""
+Cache keys for recorded structured LLM results
+
+Shared by the integration test cache (llm_cache_fixtures.py) and
+scripts/prebake_llm_fixtures.py, so results prebaked offline land where the
+tests look them up.
+"""
+
+import hashlib
+import json
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / "integration" / "_llm_cache"
+
+# Sampling settings forced on cached agent calls, so the same prompt keeps producing the same response
+DETERMINISTIC_LLM_OPTIONS = {"temperature": 0, "seed": 42}
+
+
+def _normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace, so re-indenting or re-wrapping a prompt template keeps its cache entries"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+@lru_cache(maxsize=None)
+def _schema_digest(schema) -> str:
+    """Hash of a response model's JSON schema, generated once per model rather than on every call"""
+    return hashlib.sha256(json.dumps(schema.model_json_schema(), sort_keys=True).encode()).hexdigest()
+
+
+def structured_cache_key(model: str, temperature, seed, max_tokens, schema, prompt) -> str:
+    """Hash everything that determines a structured response, independent of dict ordering and Unicode form"""
+    if isinstance(prompt, str):
+        messages = [("human", prompt)]
+    else:
+        messages = [(message.type, message.content) for message in prompt]
+    payload = {
+        "model": model.lower(),
+        "temperature": temperature,
+        "seed": seed,
+        "max_tokens": max_tokens,
+        "schema": _schema_digest(schema),
+        "messages": [(role.lower(), _normalize_text(content)) for role, content in messages]
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def structured_cache_path(llm, schema, prompt) -> Path:
+    """Cache file for a structured response from `llm`"""
+    key = structured_cache_key(llm.model_name, llm.temperature, llm.seed, llm.max_tokens, schema, prompt)
+    return CACHE_DIR / f"{key}.json"
@@ -0,0 +1,146 @@
+"""
+Lightweight test doubles for integration tests
+
+Hand-rolled async stubs that replace AsyncMock(spec=...) where a test only
+needs canned return values and a record of which calls were awaited, and an
+in-memory menu that stands in for the SQLite fixtures.
+"""
+
+from types import MappingProxyType, SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from app.services.modify_item_service import ModifyItemService
+
+
+# Canned two-item session order for the order workflow tests and benchmarks. The
+# items are read-only since the workflows never mutate them; callers take a
+# shallow copy of the order to adjust its top-level fields
+CANNED_BURGER_ITEM = MappingProxyType({
+    "id": "item_1",
+    "menu_item_id": 1,
+    "quantity": 1,
+    "modifications": MappingProxyType({
+        "size": "regular",
+        "name": "Burger",
+        "unit_price": 8.99,
+        "total_price": 8.99
+    }),
+    "added_at": "2024-01-01T12:00:00"
+})
+CANNED_FRIES_ITEM = MappingProxyType({
+    "id": "item_2",
+    "menu_item_id": 2,
+    "quantity": 1,
+    "modifications": MappingProxyType({
+        "size": "large",
+        "name": "Fries",
+        "unit_price": 3.99,
+        "total_price": 3.99
+    }),
+    "added_at": "2024-01-01T12:01:00"
+})
+CANNED_ORDER = {
+    "id": "order_1234567890",
+    "session_id": "session_123",
+    "restaurant_id": 1,
+    "status": "active",
+    "items": [CANNED_BURGER_ITEM, CANNED_FRIES_ITEM],
+    "total_amount": 12.98,
+    "subtotal": 12.98,
+    "created_at": "2024-01-01T12:00:00"
+}
+
+
+class FakeOrderSessionService:
+    """
+    Coroutine stub for OrderSessionService used by the order workflows.
+
+    Every awaited method is appended to `calls` as (name, args, kwargs) so a
+    test can check the full call trace with a single list comparison.
+    """
+
+    def __init__(self):
+        self.calls: List[Tuple[str, tuple, dict]] = []
+        self._returns: Dict[str, Any] = {}
+        self._side_effects: Dict[str, Exception] = {}
+
+    def set_return(self, name: str, value: Any) -> None:
+        """Set the value returned when method `name` is awaited"""
+        self._returns[name] = value
+
+    def set_side_effect(self, name: str, error: Exception) -> None:
+        """Make method `name` raise `error` when awaited"""
+        self._side_effects[name] = error
+
+    def _record(self, name: str, args: tuple, kwargs: dict) -> Any:
+        self.calls.append((name, args, kwargs))
+        if name in self._side_effects:
+            raise self._side_effects[name]
+        return self._returns.get(name)
+
+    async def get_session_order(self, *args, **kwargs):
+        return self._record("get_session_order", args, kwargs)
+
+    async def clear_order(self, *args, **kwargs):
+        return self._record("clear_order", args, kwargs)
+
+    async def archive_order_to_postgres(self, *args, **kwargs):
+        return self._record("archive_order_to_postgres", args, kwargs)
+
+    async def finalize_order(self, *args, **kwargs):
+        return self._record("finalize_order", args, kwargs)
+
+
+class FakeMenuRepository:
+    """
+    In-memory menu for ModifyItemService, for tests that only exercise validation.
+
+    Rows are SimpleNamespace objects with the model attributes the service reads,
+    handed to the service as its preloaded menu and ingredient caches, so no
+    database is needed.
+    """
+
+    def __init__(self):
+        self.menu_items: Dict[int, SimpleNamespace] = {}
+        self.ingredients: Dict[str, SimpleNamespace] = {}
+
+    def add_menu_item(self, id: int, name: str, max_quantity: Optional[int] = None, **fields) -> SimpleNamespace:
+        """Add a menu item row under its id"""
+        self.menu_items[id] = SimpleNamespace(id=id, name=name, max_quantity=max_quantity, **fields)
+        return self.menu_items[id]
+
+    def add_ingredient(self, name: str, **fields) -> SimpleNamespace:
+        """Add an ingredient row under its lowercased name"""
+        self.ingredients[name.lower()] = SimpleNamespace(name=name, **fields)
+        return self.ingredients[name.lower()]
+
+    def service(self, **kwargs) -> "ModifyItemService":
+        """A ModifyItemService that validates against this menu"""
+        # Imported here so workflow tests that only need the order fakes don't load the service
+        from app.services.modify_item_service import ModifyItemService
+        return ModifyItemService(menu_cache=self.menu_items, ingredient_cache=self.ingredients, **kwargs)
+
+
+class FakeIngredientService:
+    """
+    IngredientService stand-in over a fixed set of ingredient names.
+
+    The result lists are built once, so the double can be shared by every test
+    in a module; search_by_name matches case-insensitively like the real query.
+    """
+
+    def __init__(self, restaurant_id: int, names: Tuple[str, ...]):
+        self.restaurant_id = restaurant_id
+        self._ingredients = tuple(SimpleNamespace(name=name) for name in sorted(names))
+        self._all = self._result(self._ingredients)
+
+    def _result(self, ingredients: Tuple[SimpleNamespace, ...]) -> SimpleNamespace:
+        return SimpleNamespace(ingredients=ingredients, total_count=len(ingredients), restaurant_id=self.restaurant_id)
+
+    async def get_by_restaurant(self, restaurant_id: int) -> SimpleNamespace:
+        return self._all
+
+    async def search_by_name(self, restaurant_id: int, name: str) -> SimpleNamespace:
+        name = name.lower()
+        return self._result(tuple(ingredient for ingredient in self._ingredients if name in ingredient.name.lower()))
@@ -0,0 +1,141 @@
+"""
+Helpers for integration tests
+
+Debug output is only produced when DEBUG_INTEGRATION is set, and goes through
+logger.debug so quiet runs skip formatting entirely.
+"""
+
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import pytest
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+_DEBUG = bool(os.environ.get("DEBUG_INTEGRATION"))
+
+
+def _dump_context_result(name, user_input, conversation_history, command_history, current_order, result):
+    """Log a context agent scenario and its result for manual inspection"""
+    if not _DEBUG:
+        return
+
+    logger.debug(f"[{name}]")
+    logger.debug(f"Input: '{user_input}'")
+    logger.debug("Conversation History:")
+    for i, turn in enumerate(conversation_history):
+        logger.debug(f"  {i+1}. {turn['role']}: {turn['content']}")
+    logger.debug("Command History:")
+    for i, cmd in enumerate(command_history):
+        logger.debug(f"  {i+1}. {cmd['action']}: {cmd['description']}")
+    logger.debug(f"Current Order: {current_order}")
+    logger.debug(
+        f"Result: status={result.status}, resolved_text={result.resolved_text}, "
+        f"clarification_message={result.clarification_message}, "
+        f"confidence={result.confidence}, rationale={result.rationale}"
+    )
+
+
+def _modifier_words(modifiers):
+    """Set of lowercased words across all modifiers, for O(1) keyword checks"""
+    return {word for modifier in modifiers for word in re.findall(r"[a-z]+", modifier.lower())}
+
+
+def _skip_unless_smoke_passed(request, smoke_test, smoke_fixture):
+    """
+    Skip the current test if the module's cheap smoke call shows the agent is broken.
+
+    The smoke test itself always runs so the real failure is reported once. The
+    smoke result comes from a module-scoped fixture, so it works per xdist worker.
+    """
+    if request.node.originalname == smoke_test:
+        return
+    smoke_result = request.getfixturevalue(smoke_fixture)
+    if not smoke_result.success:
+        pytest.skip(f"{smoke_test} failed, so the agent is not worth calling again")
+
+
+@lru_cache(maxsize=None)
+def _keyword_pattern(keyword):
+    """Case-insensitive pattern for a keyword, matched anywhere in the text, compiled once"""
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
+
+def _mentions(texts, keywords):
+    """Whether any of the texts mentions any of the keywords"""
+    return any(_keyword_pattern(keyword).search(text) for keyword in keywords for text in texts if text)
+
+
+class ExpectedItem(BaseModel):
+    """What an extracted item must look like; unset fields aren't checked"""
+    names: Tuple[str, ...] = ()
+    quantity: Optional[int] = None
+    size: Optional[str] = None
+    modifiers: Tuple[str, ...] = ()
+    min_confidence: Optional[float] = None
+
+    def describe(self):
+        """Short label for failure messages"""
+        return "/".join(self.names) or "item"
+
+    def differences(self, item) -> List[str]:
+        """Every way the extracted item falls short of this expectation"""
+        label = self.describe()
+        differences = []
+        if self.quantity is not None and item.quantity != self.quantity:
+            differences.append(f"{label}: quantity {item.quantity} != {self.quantity}")
+        if self.size is not None and not _mentions([item.size], [self.size]):
+            differences.append(f"{label}: size {item.size!r} doesn't mention {self.size!r}")
+        for modifier in self.modifiers:
+            if not _mentions(item.modifiers, [modifier]):
+                differences.append(f"{label}: no modifier mentions {modifier!r} in {item.modifiers}")
+        if self.min_confidence is not None and item.confidence < self.min_confidence:
+            differences.append(f"{label}: confidence {item.confidence} < {self.min_confidence}")
+        return differences
+
+
+class ExpectedExtraction(BaseModel):
+    """
+    What an ItemExtractionResponse must look like, checked in one pass so a
+    failure reports every difference at once.
+
+    Expected items are matched to extracted items by name keyword, or by
+    position when no names are given.
+    """
+    success: bool = True
+    min_confidence: Optional[float] = None
+    items: List[ExpectedItem] = []
+    exact_item_count: bool = True
+
+    def differences(self, result) -> List[str]:
+        """Every way the extraction falls short of this expectation"""
+        differences = []
+        if result.success is not self.success:
+            differences.append(f"success {result.success} != {self.success}")
+        if self.min_confidence is not None and result.confidence < self.min_confidence:
+            differences.append(f"confidence {result.confidence} < {self.min_confidence}")
+        if self.exact_item_count and len(result.extracted_items) != len(self.items):
+            differences.append(f"{len(result.extracted_items)} items extracted, expected {len(self.items)}")
+
+        for position, expected in enumerate(self.items):
+            if expected.names:
+                item = next(
+                    (item for item in result.extracted_items if _mentions([item.item_name], expected.names)),
+                    None
+                )
+            else:
+                item = result.extracted_items[position] if position < len(result.extracted_items) else None
+            if item is None:
+                differences.append(f"no extracted item matches {expected.describe()}")
+            else:
+                differences.extend(expected.differences(item))
+        return differences
+
+    def assert_matches(self, result):
+        """Assert the extraction matches, listing all differences on failure"""
+        differences = self.differences(result)
+        assert not differences, "; ".join(differences)
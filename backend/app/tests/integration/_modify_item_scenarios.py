@@ -0,0 +1,211 @@
+"""
+Orders, histories and user inputs for the modify item service scenarios
+
+The integration tests in app/tests/integration/test_modify_item_agent_service_integration.py
+run these through modify_item_agent, and scripts/prebake_llm_fixtures.py submits the same
+requests through the Batch API, so both need one source that doesn't depend on pytest.
+"""
+
+from datetime import datetime, timedelta
+
+from app.dto.conversation_dto import ConversationEntry, ConversationHistory, ConversationRole
+
+
+# Fixed conversation timestamps, so every run builds identical histories
+FROZEN_TS = datetime(2024, 1, 1, 12, 0, 0)
+
+
+# Orders and histories the agent sees. The service mutates orders, so each caller gets a fresh one
+# built from the literal, which is cheaper than a deepcopy or pickle round trip of a shared canonical order
+
+def sample_order():
+    """Order with 4 burgers on a single line item"""
+    return {
+        "id": "order_1234567890",
+        "session_id": "session_123",
+        "restaurant_id": 1,
+        "status": "active",
+        "items": [
+            {
+                "id": "item_1234567890",
+                "menu_item_id": 1,  # Burger
+                "quantity": 4,  # 4 sandwiches
+                "modifications": {
+                    "size": "regular",
+                    "name": "Burger",
+                    "unit_price": 10.0,
+                    "total_price": 40.0,  # 4 * 10.0
+                    "ingredient_modifications": "",
+                    "special_instructions": ""
+                },
+                "added_at": "2024-01-01T12:00:00"
+            }
+        ]
+    }
+
+
+def second_burger_item():
+    """A second, large burger line item that makes "that burger" ambiguous"""
+    return {
+        "id": "item_1234567891",
+        "menu_item_id": 1,  # Same menu item ID
+        "quantity": 2,
+        "modifications": {
+            "size": "large",
+            "name": "Burger",
+            "unit_price": 12.0,
+            "total_price": 24.0,
+            "ingredient_modifications": "",
+            "special_instructions": ""
+        },
+        "added_at": "2024-01-01T12:02:00"
+    }
+
+
+def multi_item_order():
+    """Order with burgers, fries and a drink on separate line items"""
+    return {
+        "id": "order_1234567890",
+        "session_id": "session_123",
+        "restaurant_id": 1,
+        "status": "active",
+        "items": [
+            {
+                "id": "item_111",
+                "menu_item_id": 1,
+                "quantity": 2,
+                "modifications": {
+                    "size": "regular",
+                    "name": "Burger",
+                    "unit_price": 10.0,
+                    "total_price": 20.0,
+                    "ingredient_modifications": "",
+                    "special_instructions": ""
+                },
+                "added_at": "2024-01-01T12:00:00"
+            },
+            {
+                "id": "item_222",
+                "menu_item_id": 2,
+                "quantity": 1,
+                "modifications": {
+                    "size": "large",
+                    "name": "Fries",
+                    "unit_price": 5.0,
+                    "total_price": 5.0,
+                    "ingredient_modifications": "",
+                    "special_instructions": ""
+                },
+                "added_at": "2024-01-01T12:01:00"
+            },
+            {
+                "id": "item_333",
+                "menu_item_id": 3,
+                "quantity": 1,
+                "modifications": {
+                    "size": "medium",
+                    "name": "Drink",
+                    "unit_price": 3.0,
+                    "total_price": 3.0,
+                    "ingredient_modifications": "",
+                    "special_instructions": ""
+                },
+                "added_at": "2024-01-01T12:02:00"
+            }
+        ]
+    }
+
+
+def burger_and_fries_order():
+    """Order with a burger then fries, for references to the last item"""
+    return {
+        "id": "order_1234567890",
+        "session_id": "session_123",
+        "restaurant_id": 1,
+        "status": "active",
+        "items": [
+            {
+                "id": "item_111",
+                "menu_item_id": 1,
+                "quantity": 1,
+                "modifications": {
+                    "size": "regular",
+                    "name": "Burger",
+                    "unit_price": 10.0,
+                    "total_price": 10.0,
+                    "ingredient_modifications": "",
+                    "special_instructions": ""
+                },
+                "added_at": "2024-01-01T12:00:00"
+            },
+            {
+                "id": "item_222",
+                "menu_item_id": 2,
+                "quantity": 1,
+                "modifications": {
+                    "size": "large",
+                    "name": "Fries",
+                    "unit_price": 5.0,
+                    "total_price": 5.0,
+                    "ingredient_modifications": "",
+                    "special_instructions": ""
+                },
+                "added_at": "2024-01-01T12:01:00"
+            }
+        ]
+    }
+
+
+def conversation_history():
+    """Sample conversation history"""
+    history = ConversationHistory(session_id="test_session")
+    history.add_entry(ConversationRole.USER, "I want a burger")
+    history.add_entry(ConversationRole.ASSISTANT, "Added burger to your order")
+    history.add_entry(ConversationRole.USER, "And some fries")
+    history.add_entry(ConversationRole.ASSISTANT, "Added fries to your order")
+    return history
+
+
+def pronoun_conversation_history():
+    """History whose most recently mentioned item is a burger"""
+    return ConversationHistory(
+        entries=[
+            ConversationEntry(
+                role=ConversationRole.USER,
+                content="I want a burger",
+                timestamp=FROZEN_TS,
+                session_id="test_session"
+            ),
+            ConversationEntry(
+                role=ConversationRole.ASSISTANT,
+                content="I've added a burger to your order",
+                timestamp=FROZEN_TS + timedelta(seconds=1),
+                session_id="test_session"
+            )
+        ],
+        session_id="test_session"
+    )
+
+
+def agent_requests():
+    """(current order items, conversation history) modify_item_agent is given for each scenario's user input"""
+    sample_items = sample_order()["items"]
+    history = conversation_history()
+    return {
+        "Make 2 of those burgers extra cheese and 1 with no pickles": (sample_items, history),
+        "No pickles on the burger": (sample_items, history),
+        "I only want 2 burgers total": (sample_items, history),
+        "Make all the burgers extra cheese": (sample_items, history),
+        "Make the pizza extra cheese": (sample_items, history),
+        "Make the fries with bacon": (sample_items, history),
+        "Make that burger extra cheese": (sample_items + [second_burger_item()], history),
+        "Change the quantity to 100": (sample_items, history),
+        "Make the burger with unicorn meat": (sample_items, history),
+        "Make the burger extra cheese and the fries extra salty": (multi_item_order()["items"], history),
+        "Make the burger large": (sample_items, history),
+        "Make the burger with unicorn meat and change quantity to 100": (sample_items, history),
+        "Make the burger extra cheese and extra unicorn meat": (sample_items, history),
+        "Make the last thing I ordered extra cheese": (burger_and_fries_order()["items"], history),
+        "Make the burger with no nothing": (sample_items, history),
+        "Make it extra cheese": (sample_items, pronoun_conversation_history()),
+    }
@@ -8,7 +8,6 @@ when items fail or are ambiguous, using tools to search for alternatives.
 import pytest
 from app.workflow.agents.clarification_agent import clarification_agent
 from app.workflow.response.clarification_response import ClarificationContext
-from app.config.settings import settings
 from app.tests.fixtures.database_fixtures import (
     test_db,
     test_restaurant,
@@ -18,10 +17,7 @@ from app.tests.fixtures.database_fixtures import (
 
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 
 class TestClarificationAgentIntegration:
@@ -1,16 +1,291 @@
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+import ahocorasick
+import httpx
 import pytest
 from app.workflow.agents.context_agent import ContextAgent, ContextAgentResult
 from app.config.settings import settings
 from app.dto.conversation_dto import ConversationHistory, ConversationRole
 
-# Skip all tests in this file if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+logger = logging.getLogger("context_agent_tests")
+
+
+def _mock_context_response(
+    resolved_text: str = None,
+    status: str = "SUCCESS",
+    clarification_message: str = None,
+    confidence: float = 0.95
+) -> dict:
+    """Build a canned Chat Completions body carrying a context resolution"""
+    content = json.dumps({
+        "status": status,
+        "resolved_text": resolved_text,
+        "clarification_message": clarification_message,
+        "confidence": confidence,
+        "rationale": "Canned test response"
+    })
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+
+# user_input -> canned OpenAI reply for that scenario
+_CANNED_RESPONSES = {
+    "I'll take two of those": _mock_context_response("I'll take two veggie wraps"),
+    "Cool I'll take that but no cheese and extra lettuce.": _mock_context_response(
+        "I'll take a quantum burger with no cheese and extra lettuce"
+    ),
+    "I'll take the fries": _mock_context_response("I'll take the cosmic fries"),
+    "Okay great I'll take three of those..wait..on second thought, I'll take three of the first one instead.": _mock_context_response(
+        "I'll take three veggie wraps"
+    ),
+    "What's the difference between the two?": _mock_context_response(
+        "What's the difference between the quantum burger and the neon burger?"
+    ),
+    "On second thought, take that off.": _mock_context_response(
+        "Remove the lunar lemonade from my order"
+    ),
+    "Actually make that lots of croutons AND extra blue cheese.": _mock_context_response(
+        "Change the quantum salad to lots of croutons and extra blue cheese"
+    ),
+    "Actually no I changed my mind, take the shakes off.": _mock_context_response(
+        "Remove the strawberry shakes and the chocolate shake from my order"
+    ),
+    "I'll take two veggie wraps....Stevie stop hitting your sister...and three chocolate milkshakes...and wait I told you to stop fighting or I'm leaving the drive thru...and two quantum burgers. Actually make that 3.": _mock_context_response(
+        "I'll take two veggie wraps, three chocolate milkshakes, and three quantum burgers"
+    ),
+    "Can I get the thing with the thing?": _mock_context_response(
+        status="UNRESOLVABLE",
+        clarification_message="Sorry, could you tell me which item you'd like?",
+        confidence=0.2
+    ),
+}
+
+
+def _respond_to_context_prompt(request: httpx.Request, *args, **kwargs) -> httpx.Response:
+    """Answer a mocked Chat Completions request based on the prompt's USER INPUT"""
+    prompt = json.loads(request.content)["messages"][-1]["content"]
+    for user_input, body in _CANNED_RESPONSES.items():
+        if f'USER INPUT: "{user_input}"' in prompt:
+            return httpx.Response(200, json=body)
+    return httpx.Response(404, json={"error": {"message": "No canned response for prompt"}})
+
+
+# Samples per scenario for the stochastic tests. The mocked endpoint always
+# returns the same canned reply, so one is enough; raise it when pointing the
+# suite at a live model.
+_SAMPLES = int(os.environ.get("DRIVETHRU_STOCHASTIC_SAMPLES", "1"))
+
+# Upper bound on in-flight OpenAI requests in the batched test, to stay under
+# the account's rate limits when running against a live model
+_MAX_CONCURRENT_REQUESTS = int(os.environ.get("DRIVETHRU_LLM_CONCURRENCY", "10"))
+
+
+# Assistant turns shared by several conversation fixtures
+_MESSAGES = {
+    "veggie_wrap_desc": {
+        "role": "assistant",
+        "content": "The veggie wrap is a healthy option with fresh lettuce, tomatoes, cucumbers, red onions, and our house-made hummus spread, all wrapped in a whole wheat tortilla. It's perfect for a light meal and comes with a side of mixed greens."
+    },
+    "quantum_burger_desc": {
+        "role": "assistant",
+        "content": "The quantum burger comes with a beef patty, cosmic cheese, space sauce, quantum lettuce, and stellar onions on a stellar bun. It's our signature burger with a cosmic twist!"
+    },
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One context resolution scenario, wired to the class fixtures by name.
+
+    must_contain entries are phrases the lowercased resolved text must contain;
+    a tuple entry passes if any one of its alternatives is present. A
+    must_contain of None means the agent is expected to ask for clarification.
+    """
+    id: str
+    user_input: str
+    history_fixture: str
+    cmd_fixture: Optional[str]
+    order_fixture: str
+    must_contain: Optional[Tuple[Union[str, Tuple[str, ...]], ...]]
+
+
+_SCENARIOS = [
+    Scenario(
+        id="veggie_wrap",
+        user_input="I'll take two of those",
+        history_fixture="veggie_wrap_conversation_history",
+        cmd_fixture="veggie_wrap_command_history",
+        order_fixture="empty_current_order",
+        must_contain=("veggie wrap",)
+    ),
+    Scenario(
+        id="quantum_burger_with_modifiers",
+        user_input="Cool I'll take that but no cheese and extra lettuce.",
+        history_fixture="quantum_burger_conversation_history",
+        cmd_fixture="quantum_burger_command_history",
+        order_fixture="empty_current_order",
+        must_contain=("quantum burger", "no cheese", "extra lettuce")
+    ),
+    Scenario(
+        id="multiple_items",
+        user_input="I'll take the fries",
+        history_fixture="multiple_items_conversation_history",
+        cmd_fixture="multiple_items_command_history",
+        order_fixture="empty_current_order",
+        must_contain=("cosmic fries",)
+    ),
+    Scenario(
+        id="context_switch",
+        user_input="Okay great I'll take three of those..wait..on second thought, I'll take three of the first one instead.",
+        history_fixture="context_switch_conversation_history",
+        cmd_fixture="context_switch_command_history",
+        order_fixture="empty_current_order",
+        must_contain=("veggie wrap", "three")
+    ),
+    Scenario(
+        id="question_context",
+        user_input="What's the difference between the two?",
+        history_fixture="question_context_conversation_history",
+        cmd_fixture="question_context_command_history",
+        order_fixture="empty_current_order",
+        must_contain=("quantum burger", "neon burger", "difference")
+    ),
+    Scenario(
+        id="remove_item",
+        user_input="On second thought, take that off.",
+        history_fixture="remove_item_conversation_history",
+        cmd_fixture="remove_item_command_history",
+        order_fixture="order_with_lunar_lemonade",
+        must_contain=("lunar lemonade", ("remove", "take off"))
+    ),
+    Scenario(
+        id="modify_item",
+        user_input="Actually make that lots of croutons AND extra blue cheese.",
+        history_fixture="modify_item_conversation_history",
+        cmd_fixture="modify_item_command_history",
+        order_fixture="order_with_quantum_salad",
+        must_contain=("quantum salad", "croutons", "blue cheese")
+    ),
+    Scenario(
+        id="complex_order_removal",
+        user_input="Actually no I changed my mind, take the shakes off.",
+        history_fixture="complex_order_conversation_history",
+        cmd_fixture="complex_order_command_history",
+        order_fixture="complex_order_with_multiple_items",
+        must_contain=("shake", ("remove", "take off"))
+    ),
+    Scenario(
+        id="noisy_conversation",
+        user_input="I'll take two veggie wraps....Stevie stop hitting your sister...and three chocolate milkshakes...and wait I told you to stop fighting or I'm leaving the drive thru...and two quantum burgers. Actually make that 3.",
+        history_fixture="noisy_conversation_history",
+        cmd_fixture=None,
+        order_fixture="empty_current_order",
+        must_contain=("veggie wrap", "chocolate milkshake", "quantum burger")
+    ),
+    Scenario(
+        id="unresolvable",
+        user_input="Can I get the thing with the thing?",
+        history_fixture="unresolvable_conversation_history",
+        cmd_fixture=None,
+        order_fixture="empty_current_order",
+        must_contain=None
+    ),
+]
+
+# Scenarios whose only expectations are phrases in the resolved text; the
+# noisy and unresolvable scenarios keep dedicated tests below
+_RESOLUTION_SCENARIOS = [
+    scenario for scenario in _SCENARIOS
+    if scenario.id not in ("noisy_conversation", "unresolvable")
+]
+
+
+def _make_matcher(must_contain) -> ahocorasick.Automaton:
+    """
+    Compile a scenario's phrases into one Aho-Corasick automaton.
+
+    Every alternative maps to the index of its must_contain entry, so a
+    single pass over the resolved text reports which entries were found.
+    """
+    automaton = ahocorasick.Automaton()
+    for index, phrase in enumerate(must_contain):
+        for alt in (phrase if isinstance(phrase, tuple) else (phrase,)):
+            automaton.add_word(alt, index)
+    automaton.make_automaton()
+    return automaton
+
+
+_MATCHERS = {
+    scenario.id: _make_matcher(scenario.must_contain)
+    for scenario in _SCENARIOS
+    if scenario.must_contain
+}
+
+
+def _check_scenario(scenario: Scenario, result: ContextAgentResult) -> None:
+    """Assert a result meets its scenario's expectations"""
+    assert isinstance(result, ContextAgentResult)
+    if scenario.must_contain is None:
+        assert result.status in ["UNRESOLVABLE", "CLARIFICATION_NEEDED"], f"{scenario.id}: {result.status}"
+        assert result.clarification_message is not None, scenario.id
+        return
+
+    assert result.status == "SUCCESS", f"{scenario.id}: {result.status} - {result.rationale}"
+    text = result.resolved_text.lower()
+    found = {index for _, index in _MATCHERS[scenario.id].iter(text)}
+    missing = [
+        phrase for index, phrase in enumerate(scenario.must_contain)
+        if index not in found
+    ]
+    assert not missing, f"{scenario.id}: '{result.resolved_text}' is missing {missing}"
+
+
+def _log_result(label: str, user_input: str, result: ContextAgentResult) -> None:
+    """Log a human-readable banner for one resolution, for manual inspection"""
+    logger.info(f"[{label}]")
+    logger.info(f"Input: '{user_input}'")
+    logger.info(f"Result: {result.status} - {result.resolved_text}")
+    logger.info(f"Confidence: {result.confidence}")
+
 
 class TestContextAgentComprehensive:
-    """Comprehensive integration tests for ContextAgent with various scenarios"""
+    """
+    Comprehensive integration tests for ContextAgent with various scenarios
+
+    Scenario data fixtures are class-scoped and built once; ContextAgent only
+    reads the histories and order, so tests must not mutate them either.
+    """
+
+    @pytest.fixture(autouse=True)
+    def mock_openai(self, openai_mock, monkeypatch):
+        """Serve canned context resolutions instead of calling OpenAI"""
+        monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+        openai_mock.chat.completions.create.response = _respond_to_context_prompt
+        # The mock only intercepts requests while its respx router is active
+        with openai_mock.router:
+            yield openai_mock
+
+    @pytest.fixture
+    def context_agent(self, mock_openai):
+        """Own ContextAgent, so the client it builds with the fake key never reaches the shared session agent"""
+        return ContextAgent()
 
     def _create_conversation_history(self, session_id: str, conversations: list) -> ConversationHistory:
         """Helper method to create ConversationHistory from conversation data"""
@@ -20,35 +295,37 @@ class TestContextAgentComprehensive:
             history.add_entry(role, conv["content"])
         return history
 
-    @pytest.fixture
-    def context_agent(self):
-        """Create ContextAgent instance for testing"""
-        return ContextAgent()
+    def _create_command_history(self, session_id: str, commands: list) -> ConversationHistory:
+        """Helper method to create a command ConversationHistory from command data"""
+        history = ConversationHistory(session_id=session_id)
+        for cmd in commands:
+            history.add_entry(ConversationRole.SYSTEM, f"{cmd['action']}: {cmd['description']}")
+        return history
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def veggie_wrap_conversation_history(self):
         """Realistic conversation about veggie wrap"""
         conversations = [
             {"role": "customer", "content": "Tell me about the veggie wrap"},
-            {"role": "assistant", "content": "The veggie wrap is a healthy option with fresh lettuce, tomatoes, cucumbers, red onions, and our house-made hummus spread, all wrapped in a whole wheat tortilla. It's perfect for a light meal and comes with a side of mixed greens."},
+            _MESSAGES["veggie_wrap_desc"],
             {"role": "customer", "content": "Okay I'll take two of those"}
         ]
         return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def quantum_burger_conversation_history(self):
         """Realistic conversation about quantum burger with modifiers"""
         conversations = [
             {"role": "customer", "content": "What's on the quantum burger?"},
-            {"role": "assistant", "content": "The quantum burger comes with a beef patty, cosmic cheese, space sauce, quantum lettuce, and stellar onions on a stellar bun. It's our signature burger with a cosmic twist!"},
+            _MESSAGES["quantum_burger_desc"],
             {"role": "customer", "content": "Cool I'll take that but no cheese and extra lettuce."}
         ]
         return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def multiple_items_conversation_history(self):
         """Realistic conversation about multiple items"""
-        return [
+        conversations = [
             {
                 "role": "customer",
                 "content": "Tell me about the cosmic fries"
@@ -70,19 +347,17 @@ class TestContextAgentComprehensive:
                 "content": "I'll take the fries"
             }
         ]
+        return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def context_switch_conversation_history(self):
         """Complex conversation with context switching"""
-        return [
+        conversations = [
             {
                 "role": "customer",
                 "content": "So tell me about the veggie wrap."
             },
-            {
-                "role": "assistant",
-                "content": "The veggie wrap is a healthy option with fresh lettuce, tomatoes, cucumbers, red onions, and our house-made hummus spread, all wrapped in a whole wheat tortilla. It's perfect for a light meal and comes with a side of mixed greens."
-            },
+            _MESSAGES["veggie_wrap_desc"],
             {
                 "role": "customer",
                 "content": "Well what about the quantum salad, what's on that?"
@@ -96,19 +371,17 @@ class TestContextAgentComprehensive:
                 "content": "Okay great I'll take three of those..wait..on second thought, I'll take three of the first one instead."
             }
         ]
+        return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def question_context_conversation_history(self):
         """Conversation about multiple burgers with questions"""
-        return [
+        conversations = [
             {
                 "role": "customer",
                 "content": "So what's on the quantum burger?"
             },
-            {
-                "role": "assistant",
-                "content": "The quantum burger comes with a beef patty, cosmic cheese, space sauce, quantum lettuce, and stellar onions on a stellar bun. It's our signature burger with a cosmic twist!"
-            },
+            _MESSAGES["quantum_burger_desc"],
             {
                 "role": "customer",
                 "content": "Okay well what's on the neon burger then?"
@@ -122,11 +395,12 @@ class TestContextAgentComprehensive:
                 "content": "What's the difference between the two?"
             }
         ]
+        return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def remove_item_conversation_history(self):
         """Conversation with item removal scenario"""
-        return [
+        conversations = [
             {
                 "role": "customer",
                 "content": "So I'll take the lunar lemonade."
@@ -140,11 +414,12 @@ class TestContextAgentComprehensive:
                 "content": "On second thought, take that off."
             }
         ]
+        return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def modify_item_conversation_history(self):
         """Conversation with item modification scenario"""
-        return [
+        conversations = [
             {
                 "role": "customer",
                 "content": "So I'd love a quantum salad with lots of croutons and 2 packs of ranch dressing."
@@ -158,11 +433,12 @@ class TestContextAgentComprehensive:
                 "content": "Actually make that lots of croutons AND extra blue cheese."
             }
         ]
+        return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def complex_order_conversation_history(self):
         """Complex conversation with multiple items and modifications"""
-        return [
+        conversations = [
             {
                 "role": "customer",
                 "content": "I'll take 3 quantum burgers extra onions, 2 lunar lemonades, 2 strawberry shakes, 1 chocolate shake, and 4 orders of astro nuggets with barbecue sauce."
@@ -176,11 +452,12 @@ class TestContextAgentComprehensive:
                 "content": "Actually no I changed my mind, take the shakes off."
             }
         ]
+        return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def noisy_conversation_history(self):
         """Conversation with background noise and interruptions"""
-        return [
+        conversations = [
             {
                 "role": "customer",
                 "content": "Hi, I'd like to place an order"
@@ -194,8 +471,9 @@ class TestContextAgentComprehensive:
                 "content": "I'll take two veggie wraps....Stevie stop hitting your sister...and three chocolate milkshakes...and wait I told you to stop fighting or I'm leaving the drive thru...and two quantum burgers. Actually make that 3."
             }
         ]
+        return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def unresolvable_conversation_history(self):
         """Conversation with minimal context for unresolvable scenario"""
         conversations = [
@@ -204,30 +482,32 @@ class TestContextAgentComprehensive:
         ]
         return self._create_conversation_history("test_session", conversations)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def veggie_wrap_command_history(self):
         """Command history for veggie wrap scenario"""
-        return [
+        commands = [
             {
                 "action": "QUESTION_ANSWERED",
                 "description": "Customer asked about veggie wrap ingredients"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def quantum_burger_command_history(self):
         """Command history for quantum burger scenario"""
-        return [
+        commands = [
             {
                 "action": "QUESTION_ANSWERED",
                 "description": "Customer asked about quantum burger ingredients"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def multiple_items_command_history(self):
         """Command history for multiple items scenario"""
-        return [
+        commands = [
             {
                 "action": "QUESTION_ANSWERED",
                 "description": "Customer asked about cosmic fries"
@@ -237,11 +517,12 @@ class TestContextAgentComprehensive:
                 "description": "Customer asked about lunar lemonade"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def context_switch_command_history(self):
         """Command history for context switch scenario"""
-        return [
+        commands = [
             {
                 "action": "QUESTION_ANSWERED",
                 "description": "Customer asked about veggie wrap ingredients"
@@ -251,11 +532,12 @@ class TestContextAgentComprehensive:
                 "description": "Customer asked about quantum salad ingredients"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def question_context_command_history(self):
         """Command history for question scenario"""
-        return [
+        commands = [
             {
                 "action": "QUESTION_ANSWERED",
                 "description": "Customer asked about quantum burger ingredients"
@@ -265,31 +547,34 @@ class TestContextAgentComprehensive:
                 "description": "Customer asked about neon burger ingredients"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def remove_item_command_history(self):
         """Command history for remove item scenario"""
-        return [
+        commands = [
             {
                 "action": "ITEM_ADDED",
                 "description": "Customer added lunar lemonade to order"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def modify_item_command_history(self):
         """Command history for modify item scenario"""
-        return [
+        commands = [
             {
                 "action": "ITEM_ADDED",
                 "description": "Customer added quantum salad with croutons and ranch dressing"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def complex_order_command_history(self):
         """Command history for complex order scenario"""
-        return [
+        commands = [
             {
                 "action": "ITEM_ADDED",
                 "description": "Customer added 3 quantum burgers with extra onions"
@@ -311,8 +596,9 @@ class TestContextAgentComprehensive:
                 "description": "Customer added 4 astro nuggets with barbecue sauce"
             }
         ]
+        return self._create_command_history("test_session", commands)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def empty_current_order(self):
         """Empty current order"""
         return {
@@ -320,7 +606,7 @@ class TestContextAgentComprehensive:
             "total": 0.0
         }
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def order_with_lunar_lemonade(self):
         """Current order containing lunar lemonade"""
         return {
@@ -336,7 +622,7 @@ class TestContextAgentComprehensive:
             "total": 3.99
         }
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def order_with_quantum_salad(self):
         """Current order containing quantum salad with modifications"""
         return {
@@ -355,7 +641,7 @@ class TestContextAgentComprehensive:
             "total": 8.99
         }
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def complex_order_with_multiple_items(self):
         """Complex order with multiple items and modifications"""
         return {
@@ -403,280 +689,45 @@ class TestContextAgentComprehensive:
             "total": 33.95
         }
 
-    @pytest.mark.asyncio
-    async def test_veggie_wrap_context_resolution(
-        self,
-        context_agent,
-        veggie_wrap_conversation_history,
-        veggie_wrap_command_history,
-        empty_current_order
-    ):
-        """Test context resolution for 'I'll take two of those' after veggie wrap discussion"""
-
-        user_input = "I'll take two of those"
-
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=veggie_wrap_conversation_history,
-            command_history=veggie_wrap_command_history,
-            current_order=empty_current_order
-        )
-
-        # Verify result structure
-        assert isinstance(result, ContextAgentResult)
-        assert result.status in ["SUCCESS", "CLARIFICATION_NEEDED", "UNRESOLVABLE", "SYSTEM_ERROR"]
-
-        # Print results for analysis
-        print(f"\n[VEGGIE WRAP TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
-
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "veggie wrap" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-
-    @pytest.mark.asyncio
-    async def test_quantum_burger_with_modifiers(
-        self,
-        context_agent,
-        quantum_burger_conversation_history,
-        quantum_burger_command_history,
-        empty_current_order
-    ):
-        """Test context resolution for 'I'll take that but no cheese and extra lettuce' after quantum burger discussion"""
-
-        user_input = "Cool I'll take that but no cheese and extra lettuce."
-
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=quantum_burger_conversation_history,
-            command_history=quantum_burger_command_history,
-            current_order=empty_current_order
-        )
-
-        # Print results for analysis
-        print(f"\n[QUANTUM BURGER WITH MODIFIERS TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
-
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "quantum burger" in result.resolved_text.lower()
-            assert "no cheese" in result.resolved_text.lower()
-            assert "extra lettuce" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-
-    @pytest.mark.asyncio
-    async def test_multiple_items_context_resolution(
-        self,
-        context_agent,
-        multiple_items_conversation_history,
-        multiple_items_command_history,
-        empty_current_order
-    ):
-        """Test context resolution for 'I'll take the fries' after discussing multiple items"""
-
-        user_input = "I'll take the fries"
-
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=multiple_items_conversation_history,
-            command_history=multiple_items_command_history,
-            current_order=empty_current_order
-        )
-
-        # Print results for analysis
-        print(f"\n[MULTIPLE ITEMS TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
-
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "cosmic fries" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-
-    @pytest.mark.asyncio
-    async def test_context_switch_resolution(
-        self,
-        context_agent,
-        context_switch_conversation_history,
-        context_switch_command_history,
-        empty_current_order
-    ):
-        """Test context resolution for complex context switching scenario"""
-
-        user_input = "Okay great I'll take three of those..wait..on second thought, I'll take three of the first one instead."
-
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=context_switch_conversation_history,
-            command_history=context_switch_command_history,
-            current_order=empty_current_order
-        )
-
-        # Print results for analysis
-        print(f"\n[CONTEXT SWITCH TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
-
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "veggie wrap" in result.resolved_text.lower()
-            assert "three" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-
-    @pytest.mark.asyncio
-    async def test_question_context_resolution(
-        self,
-        context_agent,
-        question_context_conversation_history,
-        question_context_command_history,
-        empty_current_order
-    ):
-        """Test context resolution for question scenario with ambiguous references"""
-
-        user_input = "What's the difference between the two?"
-
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=question_context_conversation_history,
-            command_history=question_context_command_history,
-            current_order=empty_current_order
-        )
-
-        # Print results for analysis
-        print(f"\n[QUESTION CONTEXT TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
-
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "quantum burger" in result.resolved_text.lower()
-            assert "neon burger" in result.resolved_text.lower()
-            assert "difference" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-
-    @pytest.mark.asyncio
-    async def test_remove_item_context_resolution(
-        self,
-        context_agent,
-        remove_item_conversation_history,
-        remove_item_command_history,
-        order_with_lunar_lemonade
-    ):
-        """Test context resolution for remove item scenario"""
-
-        user_input = "On second thought, take that off."
-
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=remove_item_conversation_history,
-            command_history=remove_item_command_history,
-            current_order=order_with_lunar_lemonade
-        )
-
-        # Print results for analysis
-        print(f"\n[REMOVE ITEM TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
-
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "lunar lemonade" in result.resolved_text.lower()
-            assert "remove" in result.resolved_text.lower() or "take off" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-
-    @pytest.mark.asyncio
-    async def test_modify_item_context_resolution(
-        self,
-        context_agent,
-        modify_item_conversation_history,
-        modify_item_command_history,
-        order_with_quantum_salad
-    ):
-        """Test context resolution for modify item scenario with ambiguous scope"""
-
-        user_input = "Actually make that lots of croutons AND extra blue cheese."
+    def _scenario_kwargs(self, request, scenario: Scenario) -> dict:
+        """Resolve a scenario's fixtures into resolve_context keyword arguments"""
+        return {
+            "user_input": scenario.user_input,
+            "conversation_history": request.getfixturevalue(scenario.history_fixture),
+            "command_history": (
+                request.getfixturevalue(scenario.cmd_fixture) if scenario.cmd_fixture
+                else ConversationHistory(session_id="test_session")
+            ),
+            "current_order": request.getfixturevalue(scenario.order_fixture)
+        }
 
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=modify_item_conversation_history,
-            command_history=modify_item_command_history,
-            current_order=order_with_quantum_salad
-        )
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_all_scenarios_concurrently(self, request, context_agent):
+        """Resolve every scenario in one gather so the LLM round-trips overlap"""
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
 
-        # Print results for analysis
-        print(f"\n[MODIFY ITEM TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
+        async def resolve(scenario):
+            async with semaphore:
+                return await context_agent.resolve_context(**self._scenario_kwargs(request, scenario))
 
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "quantum salad" in result.resolved_text.lower()
-            assert "croutons" in result.resolved_text.lower()
-            assert "blue cheese" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-            # Note: The LLM will need to decide whether to keep ranch dressing or not
-            if "ranch" in result.resolved_text.lower():
-                print(f"   📝 LLM decided to keep ranch dressing")
-            else:
-                print(f"   📝 LLM decided to replace ranch with blue cheese")
-
-    @pytest.mark.asyncio
-    async def test_complex_order_removal_context_resolution(
-        self,
-        context_agent,
-        complex_order_conversation_history,
-        complex_order_command_history,
-        complex_order_with_multiple_items
-    ):
-        """Test context resolution for complex order with multiple item removal"""
+        results = await asyncio.gather(*[resolve(scenario) for scenario in _SCENARIOS])
 
-        user_input = "Actually no I changed my mind, take the shakes off."
+        for scenario, result in zip(_SCENARIOS, results):
+            _check_scenario(scenario, result)
 
-        result = await context_agent.resolve_context(
-            user_input=user_input,
-            conversation_history=complex_order_conversation_history,
-            command_history=complex_order_command_history,
-            current_order=complex_order_with_multiple_items
-        )
+    @pytest.mark.slow
+    @pytest.mark.asyncio(loop_scope="session")
+    @pytest.mark.stochastic(samples=_SAMPLES, threshold=0.6)
+    @pytest.mark.parametrize("scenario", _RESOLUTION_SCENARIOS, ids=lambda s: s.id)
+    async def test_context_resolution(self, request, context_agent, scenario):
+        """Test context resolution of an ambiguous utterance for one scenario"""
+        result = await context_agent.resolve_context(**self._scenario_kwargs(request, scenario))
 
-        # Print results for analysis
-        print(f"\n[COMPLEX ORDER REMOVAL TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
+        _check_scenario(scenario, result)
 
-        # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            assert "shake" in result.resolved_text.lower()
-            assert ("remove" in result.resolved_text.lower() or "take off" in result.resolved_text.lower())
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-            # Check if LLM identified both shake types
-            if "strawberry" in result.resolved_text.lower() and "chocolate" in result.resolved_text.lower():
-                print(f"   📝 LLM identified both shake types")
-            elif "shake" in result.resolved_text.lower():
-                print(f"   📝 LLM identified shakes generically")
-            else:
-                print(f"   📝 LLM identified specific shake type")
-
-    @pytest.mark.asyncio
+    @pytest.mark.slow
+    @pytest.mark.asyncio(loop_scope="session")
+    @pytest.mark.stochastic(samples=_SAMPLES, threshold=0.6)
     async def test_noisy_conversation_context_resolution(
         self,
         context_agent,
@@ -694,43 +745,24 @@ class TestContextAgentComprehensive:
             current_order=empty_current_order
         )
 
-        # Print results for analysis
-        print(f"\n[NOISY CONVERSATION TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Confidence: {result.confidence}")
-
         # Verify expected behavior
-        if result.status == "SUCCESS":
-            assert result.resolved_text is not None
-            # Should contain the main items without noise
-            assert "veggie wrap" in result.resolved_text.lower()
-            assert "chocolate milkshake" in result.resolved_text.lower()
-            assert "quantum burger" in result.resolved_text.lower()
-            # Should have correct quantities
-            assert "two" in result.resolved_text.lower() or "2" in result.resolved_text
-            assert "three" in result.resolved_text.lower() or "3" in result.resolved_text
-            # Should not contain the noise
-            assert "stevie" not in result.resolved_text.lower()
-            assert "sister" not in result.resolved_text.lower()
-            assert "fighting" not in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
-            print(f"   📝 LLM successfully filtered out background noise")
-            print(f"   📝 LLM preserved all food items and quantities")
-            print(f"   📝 LLM handled the quantity correction (2 → 3 quantum burgers)")
-
-        elif result.status == "CLARIFICATION_NEEDED":
-            assert result.clarification_message is not None
-            print(f"❓ CLARIFICATION: {result.clarification_message}")
-
-        elif result.status == "UNRESOLVABLE":
-            assert result.clarification_message is not None
-            print(f"🚫 UNRESOLVABLE: {result.clarification_message}")
-
-        else:  # SYSTEM_ERROR
-            print(f"🚨 SYSTEM ERROR: {result.rationale}")
-
-    @pytest.mark.asyncio
+        assert result.status == "SUCCESS"
+        assert result.resolved_text is not None
+        # Should contain the main items without noise
+        assert "veggie wrap" in result.resolved_text.lower()
+        assert "chocolate milkshake" in result.resolved_text.lower()
+        assert "quantum burger" in result.resolved_text.lower()
+        # Should have correct quantities
+        assert "two" in result.resolved_text.lower() or "2" in result.resolved_text
+        assert "three" in result.resolved_text.lower() or "3" in result.resolved_text
+        # Should not contain the noise
+        assert "stevie" not in result.resolved_text.lower()
+        assert "sister" not in result.resolved_text.lower()
+        assert "fighting" not in result.resolved_text.lower()
+
+    @pytest.mark.slow
+    @pytest.mark.asyncio(loop_scope="session")
+    @pytest.mark.stochastic(samples=_SAMPLES, threshold=0.6)
     async def test_unresolvable_context(
         self,
         context_agent,
@@ -748,18 +780,20 @@ class TestContextAgentComprehensive:
             current_order=empty_current_order
         )
 
-        # Print results for analysis
-        print(f"\n[UNRESOLVABLE TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"Result: {result.status} - {result.resolved_text}")
-        print(f"Clarification: {result.clarification_message}")
-        print(f"Confidence: {result.confidence}")
-
         # Verify expected behavior - should be UNRESOLVABLE or CLARIFICATION_NEEDED
         assert result.status in ["UNRESOLVABLE", "CLARIFICATION_NEEDED"]
-        if result.status == "UNRESOLVABLE":
-            assert result.clarification_message is not None
-            print(f"🚫 UNRESOLVABLE: {result.clarification_message}")
-        elif result.status == "CLARIFICATION_NEEDED":
-            assert result.clarification_message is not None
-            print(f"❓ CLARIFICATION: {result.clarification_message}")
+        assert result.clarification_message is not None
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_result_banner_shape(self, request, context_agent, caplog):
+        """Test the diagnostic banner logged for a resolution"""
+        scenario = _SCENARIOS[0]
+        result = await context_agent.resolve_context(**self._scenario_kwargs(request, scenario))
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            _log_result(scenario.id, scenario.user_input, result)
+
+        assert result.status in ["SUCCESS", "CLARIFICATION_NEEDED", "UNRESOLVABLE"]
+        assert f"[{scenario.id}]" in caplog.text
+        assert f"Result: {result.status}" in caplog.text
+        assert "Confidence:" in caplog.text
@@ -3,25 +3,17 @@ Integration tests for Context Agent with realistic conversation scenarios
 """
 
 import pytest
-from app.workflow.agents.context_agent import ContextAgent, ContextAgentResult
-from app.config.settings import settings
+from app.workflow.agents.context_agent import ContextAgentResult
+from app.tests.integration._helpers import _dump_context_result
 
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = [pytest.mark.requires_openai, pytest.mark.network]
 
 
 class TestContextAgentIntegration:
     """Integration tests for context agent with realistic scenarios"""
     
-    @pytest.fixture
-    def context_agent(self):
-        """Create ContextAgent instance for testing"""
-        return ContextAgent()
-    
     @pytest.fixture
     def veggie_wrap_conversation_history(self):
         """Realistic conversation about veggie wrap"""
@@ -126,7 +118,7 @@ class TestContextAgentIntegration:
             "total": 0.0
         }
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_veggie_wrap_context_resolution(
         self,
         context_agent,
@@ -149,22 +141,10 @@ class TestContextAgentIntegration:
         assert isinstance(result, ContextAgentResult)
         assert result.status in ["SUCCESS", "CLARIFICATION_NEEDED", "SYSTEM_ERROR"]
         
-        # Print results for analysis
-        print(f"\n[CONTEXT AGENT TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"\nConversation History:")
-        for i, turn in enumerate(veggie_wrap_conversation_history):
-            print(f"  {i+1}. {turn['role']}: {turn['content']}")
-        print(f"\nCommand History:")
-        for i, cmd in enumerate(veggie_wrap_command_history):
-            print(f"  {i+1}. {cmd['action']}: {cmd['description']}")
-        print(f"\nCurrent Order: {empty_current_order}")
-        print(f"\nResult:")
-        print(f"  Status: {result.status}")
-        print(f"  Resolved Text: {result.resolved_text}")
-        print(f"  Clarification Message: {result.clarification_message}")
-        print(f"  Confidence: {result.confidence}")
-        print(f"  Rationale: {result.rationale}")
+        _dump_context_result(
+            "CONTEXT AGENT TEST", user_input, veggie_wrap_conversation_history,
+            veggie_wrap_command_history, empty_current_order, result
+        )
         
         # Verify expected behavior
         if result.status == "SUCCESS":
@@ -172,17 +152,12 @@ class TestContextAgentIntegration:
             assert "veggie wrap" in result.resolved_text.lower()
             assert "two" in result.resolved_text.lower()
             assert result.confidence >= 0.8
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
             
         elif result.status == "CLARIFICATION_NEEDED":
             assert result.clarification_message is not None
             assert len(result.clarification_message) > 0
-            print(f"❓ CLARIFICATION: {result.clarification_message}")
-            
-        else:  # SYSTEM_ERROR
-            print(f"🚨 SYSTEM ERROR: {result.rationale}")
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_quantum_burger_with_modifiers(
         self,
         context_agent,
@@ -201,22 +176,10 @@ class TestContextAgentIntegration:
             current_order=empty_current_order
         )
         
-        # Print results for analysis
-        print(f"\n[QUANTUM BURGER WITH MODIFIERS TEST]")
-        print(f"Input: '{user_input}'")
-        print(f"\nConversation History:")
-        for i, turn in enumerate(quantum_burger_conversation_history):
-            print(f"  {i+1}. {turn['role']}: {turn['content']}")
-        print(f"\nCommand History:")
-        for i, cmd in enumerate(quantum_burger_command_history):
-            print(f"  {i+1}. {cmd['action']}: {cmd['description']}")
-        print(f"\nCurrent Order: {empty_current_order}")
-        print(f"\nResult:")
-        print(f"  Status: {result.status}")
-        print(f"  Resolved Text: {result.resolved_text}")
-        print(f"  Clarification Message: {result.clarification_message}")
-        print(f"  Confidence: {result.confidence}")
-        print(f"  Rationale: {result.rationale}")
+        _dump_context_result(
+            "QUANTUM BURGER WITH MODIFIERS TEST", user_input, quantum_burger_conversation_history,
+            quantum_burger_command_history, empty_current_order, result
+        )
         
         # Verify expected behavior
         if result.status == "SUCCESS":
@@ -224,13 +187,99 @@ class TestContextAgentIntegration:
             assert "quantum burger" in result.resolved_text.lower()
             assert "no cheese" in result.resolved_text.lower()
             assert "extra lettuce" in result.resolved_text.lower()
-            print(f"✅ SUCCESS: Resolved to '{result.resolved_text}'")
             
         elif result.status == "CLARIFICATION_NEEDED":
             assert result.clarification_message is not None
             assert len(result.clarification_message) > 0
-            print(f"❓ CLARIFICATION: {result.clarification_message}")
-            
-        else:  # SYSTEM_ERROR
-            print(f"🚨 SYSTEM ERROR: {result.rationale}")
     
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_scenarios_concurrently(
+        self,
+        resolve_contexts_concurrently,
+        veggie_wrap_conversation_history,
+        veggie_wrap_command_history,
+        quantum_burger_conversation_history,
+        quantum_burger_command_history,
+        empty_current_order
+    ):
+        """Test both scenarios resolved in one batch with overlapping LLM calls"""
+        
+        results = await resolve_contexts_concurrently([
+            {
+                "user_input": "I'll take two of those",
+                "conversation_history": veggie_wrap_conversation_history,
+                "command_history": veggie_wrap_command_history,
+                "current_order": empty_current_order
+            },
+            {
+                "user_input": "Cool I'll take that but no cheese and extra lettuce.",
+                "conversation_history": quantum_burger_conversation_history,
+                "command_history": quantum_burger_command_history,
+                "current_order": empty_current_order
+            }
+        ])
+        
+        expected_phrases = [
+            ["veggie wrap", "two"],
+            ["quantum burger", "no cheese", "extra lettuce"]
+        ]
+        
+        for result, phrases in zip(results, expected_phrases):
+            assert isinstance(result, ContextAgentResult)
+            assert result.status in ["SUCCESS", "CLARIFICATION_NEEDED", "SYSTEM_ERROR"]
+            if result.status == "SUCCESS":
+                for phrase in phrases:
+                    assert phrase in result.resolved_text.lower()
+            elif result.status == "CLARIFICATION_NEEDED":
+                assert result.clarification_message
+    
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_batch_context_scenarios(
+        self,
+        context_agent,
+        veggie_wrap_conversation_history,
+        veggie_wrap_command_history,
+        quantum_burger_conversation_history,
+        quantum_burger_command_history,
+        multiple_items_conversation_history,
+        multiple_items_command_history,
+        empty_current_order
+    ):
+        """Test all three scenarios resolved by a single batched LLM call"""
+        
+        results = await context_agent.resolve_context_batch([
+            {
+                "user_input": "I'll take two of those",
+                "conversation_history": veggie_wrap_conversation_history,
+                "command_history": veggie_wrap_command_history,
+                "current_order": empty_current_order
+            },
+            {
+                "user_input": "Cool I'll take that but no cheese and extra lettuce.",
+                "conversation_history": quantum_burger_conversation_history,
+                "command_history": quantum_burger_command_history,
+                "current_order": empty_current_order
+            },
+            {
+                "user_input": "I'll take the fries",
+                "conversation_history": multiple_items_conversation_history,
+                "command_history": multiple_items_command_history,
+                "current_order": empty_current_order
+            }
+        ])
+        
+        expected_phrases = [
+            ["veggie wrap", "two"],
+            ["quantum burger", "no cheese", "extra lettuce"],
+            ["fries"]
+        ]
+        
+        assert len(results) == len(expected_phrases)
+        for result, phrases in zip(results, expected_phrases):
+            assert isinstance(result, ContextAgentResult)
+            assert result.status in ["SUCCESS", "CLARIFICATION_NEEDED", "SYSTEM_ERROR"]
+            if result.status == "SUCCESS":
+                for phrase in phrases:
+                    assert phrase in result.resolved_text.lower()
+            elif result.status == "CLARIFICATION_NEEDED":
+                assert result.clarification_message
@@ -6,50 +6,98 @@ These tests use:
 - No database needed (pure LLM parsing)
 """
 
+import logging
+from types import MappingProxyType
+
 import pytest
-from app.workflow.agents.item_extraction_agent import item_extraction_agent
-from app.config.settings import settings
+from app.workflow.agents.item_extraction_agent import item_extraction_agent, item_extraction_agent_batch
+from app.tests.integration._helpers import ExpectedExtraction, ExpectedItem, _skip_unless_smoke_passed
+
 
+logger = logging.getLogger(__name__)
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
+pytestmark = pytest.mark.requires_openai
+
+# Read-only context shared by every test without history or an order (the agent only reads it)
+_EMPTY_CONTEXT = MappingProxyType({
+    "conversation_history": (),
+    "order_state": {},
+    "restaurant_id": "1"
+})
+
+# Expected results, built once; names, sizes and modifiers match case-insensitively anywhere in the text
+_BURGER = ("burger",)
+_FRIES = ("fries", "fry")
+
+_EXPECTED_SINGLE_BURGER = ExpectedExtraction(
+    min_confidence=0.7,
+    items=[ExpectedItem(names=_BURGER, quantity=1, min_confidence=0.7)]
 )
+_EXPECTED_BURGERS_AND_FRIES = ExpectedExtraction(
+    items=[ExpectedItem(names=_BURGER, quantity=2), ExpectedItem(names=_FRIES, quantity=3)]
+)
+_EXPECTED_LARGE_FRIES = ExpectedExtraction(items=[ExpectedItem(quantity=1, size="large")])
+_EXPECTED_BURGER_NO_PICKLES_EXTRA_CHEESE = ExpectedExtraction(
+    items=[ExpectedItem(names=_BURGER, modifiers=("pickles", "cheese"))]
+)
+_EXPECTED_NORMALIZED_MODIFIERS = ExpectedExtraction(
+    items=[ExpectedItem(modifiers=("mayo", "pickles", "onion"))],
+    exact_item_count=False
+)
+_EXPECTED_ONE_BURGER = ExpectedExtraction(items=[ExpectedItem(names=_BURGER)])
+
+
+_QUANTITY_VARIATION_INPUTS = [
+    "I want a burger",
+    "Give me two burgers",
+    "I'll have three burgers",
+    "Can I get a couple burgers",
+]
+
+
+@pytest.fixture(scope="module")
+async def quantity_variation_results(module_structured_agent_cache):
+    """Every quantity variation extracted by one batched request, keyed by user input"""
+    results = await item_extraction_agent_batch(
+        user_inputs=_QUANTITY_VARIATION_INPUTS,
+        context=_EMPTY_CONTEXT
+    )
+    assert len(results) == len(_QUANTITY_VARIATION_INPUTS)
+    return dict(zip(_QUANTITY_VARIATION_INPUTS, results))
+
+
+@pytest.fixture(scope="module")
+async def smoke_extraction(module_structured_agent_cache):
+    """The simplest extraction, made once; the same request as test_simple_single_item_extraction"""
+    return await item_extraction_agent(
+        user_input="I want a burger",
+        context=_EMPTY_CONTEXT
+    )
 
 
 class TestItemExtractionAgentIntegration:
     """Integration tests for item extraction agent with real API calls"""
     
+    @pytest.fixture(autouse=True)
+    def skip_if_smoke_failed(self, request):
+        """Skip the other tests rather than paying for a call each when the simplest extraction fails"""
+        _skip_unless_smoke_passed(request, "test_simple_single_item_extraction", "smoke_extraction")
+    
     @pytest.mark.asyncio
     async def test_simple_single_item_extraction(self):
         """Test extracting a single simple item"""
         
         result = await item_extraction_agent(
             user_input="I want a burger",
-            context={
-                "conversation_history": [],
-                "order_state": {},
-                "restaurant_id": "1"
-            }
+            context=_EMPTY_CONTEXT
         )
         
-        print(f"\n[SUCCESS] Extracted {len(result.extracted_items)} items")
-        print(f"   Success: {result.success}")
-        print(f"   Confidence: {result.confidence}")
+        logger.debug("[SUCCESS] Extracted %s items", len(result.extracted_items))
+        logger.debug("   Success: %s", result.success)
+        logger.debug("   Confidence: %s", result.confidence)
         
-        # Verify structure
-        assert result.success is True
-        assert result.confidence >= 0.7
-        assert len(result.extracted_items) == 1
-        
-        # Verify item
-        item = result.extracted_items[0]
-        assert "burger" in item.item_name.lower()
-        assert item.quantity == 1
-        assert item.confidence >= 0.7
-        
-        print(f"   Item: {item.item_name}, Qty: {item.quantity}")
+        _EXPECTED_SINGLE_BURGER.assert_matches(result)
     
     @pytest.mark.asyncio
     async def test_multiple_items_extraction(self):
@@ -57,34 +105,15 @@ class TestItemExtractionAgentIntegration:
         
         result = await item_extraction_agent(
             user_input="I'll have two burgers and three fries",
-            context={
-                "conversation_history": [],
-                "order_state": {},
-                "restaurant_id": "1"
-            }
+            context=_EMPTY_CONTEXT
         )
         
-        print(f"\n[SUCCESS] Extracted {len(result.extracted_items)} items")
-        
-        # Verify structure
-        assert result.success is True
-        assert len(result.extracted_items) == 2
-        
-        # Find burger and fries
-        items_dict = {item.item_name.lower(): item for item in result.extracted_items}
-        
-        # Verify burger
-        burger_item = next((item for item in result.extracted_items if "burger" in item.item_name.lower()), None)
-        assert burger_item is not None
-        assert burger_item.quantity == 2
-        
-        # Verify fries
-        fries_item = next((item for item in result.extracted_items if "fries" in item.item_name.lower() or "fry" in item.item_name.lower()), None)
-        assert fries_item is not None
-        assert fries_item.quantity == 3
+        logger.debug("[SUCCESS] Extracted %s items", len(result.extracted_items))
         
         for item in result.extracted_items:
-            print(f"   - {item.quantity}x {item.item_name}")
+            logger.debug("   - %sx %s", item.quantity, item.item_name)
+        
+        _EXPECTED_BURGERS_AND_FRIES.assert_matches(result)
     
     @pytest.mark.asyncio
     async def test_item_with_size_extraction(self):
@@ -92,24 +121,12 @@ class TestItemExtractionAgentIntegration:
         
         result = await item_extraction_agent(
             user_input="Give me a large fries",
-            context={
-                "conversation_history": [],
-                "order_state": {},
-                "restaurant_id": "1"
-            }
+            context=_EMPTY_CONTEXT
         )
         
-        print(f"\n[SUCCESS] Extracted item with size")
+        logger.debug("[SUCCESS] Extracted item with size")
         
-        assert result.success is True
-        assert len(result.extracted_items) == 1
-        
-        item = result.extracted_items[0]
-        assert item.quantity == 1
-        assert item.size is not None
-        assert "large" in item.size.lower()
-        
-        print(f"   Item: {item.item_name}, Size: {item.size}, Qty: {item.quantity}")
+        _EXPECTED_LARGE_FRIES.assert_matches(result)
     
     @pytest.mark.asyncio
     async def test_item_with_modifiers_extraction(self):
@@ -117,29 +134,16 @@ class TestItemExtractionAgentIntegration:
         
         result = await item_extraction_agent(
             user_input="I want a burger with no pickles and extra cheese",
-            context={
-                "conversation_history": [],
-                "order_state": {},
-                "restaurant_id": "1"
-            }
+            context=_EMPTY_CONTEXT
         )
         
-        print(f"\n[SUCCESS] Extracted item with modifiers")
+        logger.debug("[SUCCESS] Extracted item with modifiers")
         
-        assert result.success is True
-        assert len(result.extracted_items) == 1
-        
-        item = result.extracted_items[0]
-        assert "burger" in item.item_name.lower()
-        assert len(item.modifiers) >= 2
+        logger.debug("   Modifiers: %s", result.extracted_items[0].modifiers)
         
-        # Check for modifier normalization
-        modifiers_str = " ".join(item.modifiers).lower()
-        assert "no pickles" in modifiers_str or "pickles" in modifiers_str
-        assert "extra cheese" in modifiers_str or "cheese" in modifiers_str
-        
-        print(f"   Item: {item.item_name}")
-        print(f"   Modifiers: {item.modifiers}")
+        # Pickles and cheese are two separate modifiers
+        _EXPECTED_BURGER_NO_PICKLES_EXTRA_CHEESE.assert_matches(result)
+        assert len(result.extracted_items[0].modifiers) >= 2
     
     @pytest.mark.asyncio
     async def test_complex_order_extraction(self):
@@ -147,20 +151,16 @@ class TestItemExtractionAgentIntegration:
         
         result = await item_extraction_agent(
             user_input="I'll have two large burgers with extra cheese, a small fries, and three medium cokes",
-            context={
-                "conversation_history": [],
-                "order_state": {},
-                "restaurant_id": "1"
-            }
+            context=_EMPTY_CONTEXT
         )
         
-        print(f"\n[SUCCESS] Extracted complex order with {len(result.extracted_items)} items")
+        logger.debug("[SUCCESS] Extracted complex order with %s items", len(result.extracted_items))
         
         assert result.success is True
         assert len(result.extracted_items) == 3
         
         for item in result.extracted_items:
-            print(f"   - {item.quantity}x {item.size or ''} {item.item_name} {item.modifiers}")
+            logger.debug("   - %sx %s %s %s", item.quantity, item.size or '', item.item_name, item.modifiers)
     
     @pytest.mark.asyncio
     async def test_ambiguous_item_extraction(self):
@@ -168,16 +168,12 @@ class TestItemExtractionAgentIntegration:
         
         result = await item_extraction_agent(
             user_input="I'll have the special",
-            context={
-                "conversation_history": [],
-                "order_state": {},
-                "restaurant_id": "1"
-            }
+            context=_EMPTY_CONTEXT
         )
         
-        print(f"\n[SUCCESS] Handled ambiguous item")
-        print(f"   Confidence: {result.confidence}")
-        print(f"   Needs clarification: {result.needs_clarification}")
+        logger.debug("[SUCCESS] Handled ambiguous item")
+        logger.debug("   Confidence: %s", result.confidence)
+        logger.debug("   Needs clarification: %s", result.needs_clarification)
         
         # Ambiguous items should have lower confidence
         assert len(result.extracted_items) == 1
@@ -186,7 +182,7 @@ class TestItemExtractionAgentIntegration:
         # Either low confidence OR needs clarification
         assert item.confidence < 0.8 or result.needs_clarification
         
-        print(f"   Item: {item.item_name}, Confidence: {item.confidence}")
+        logger.debug("   Item: %s, Confidence: %s", item.item_name, item.confidence)
     
     @pytest.mark.asyncio
     async def test_modifier_normalization(self):
@@ -194,31 +190,16 @@ class TestItemExtractionAgentIntegration:
         
         result = await item_extraction_agent(
             user_input="I want a burger with tons of mayo, hold the pickles, and light on the onions",
-            context={
-                "conversation_history": [],
-                "order_state": {},
-                "restaurant_id": "1"
-            }
+            context=_EMPTY_CONTEXT
         )
         
-        print(f"\n[SUCCESS] Modifier normalization test")
-        
-        assert result.success is True
-        item = result.extracted_items[0]
+        logger.debug("[SUCCESS] Modifier normalization test")
         
-        print(f"   Modifiers: {item.modifiers}")
+        logger.debug("   Modifiers: %s", result.extracted_items[0].modifiers)
         
-        # Check normalization (should include ingredient names)
-        modifiers_str = " ".join(item.modifiers).lower()
-        
-        # "tons of mayo" should normalize to "extra mayo"
-        assert ("extra" in modifiers_str and "mayo" in modifiers_str) or "mayo" in modifiers_str
-        
-        # "hold the pickles" should normalize to "no pickles"
-        assert ("no" in modifiers_str and "pickles" in modifiers_str) or "pickles" in modifiers_str
-        
-        # "light on the onions" should normalize to "light onions"
-        assert ("light" in modifiers_str and "onion" in modifiers_str) or "onion" in modifiers_str
+        # Normalized modifiers keep their ingredient names
+        # ("tons of mayo" -> "extra mayo", "hold the pickles" -> "no pickles", "light on the onions" -> "light onions")
+        _EXPECTED_NORMALIZED_MODIFIERS.assert_matches(result)
     
     @pytest.mark.asyncio
     async def test_with_conversation_history(self):
@@ -238,42 +219,21 @@ class TestItemExtractionAgentIntegration:
             }
         )
         
-        print(f"\n[SUCCESS] Used conversation history for context")
+        logger.debug("[SUCCESS] Used conversation history for context")
         
-        assert result.success is True
-        assert len(result.extracted_items) == 1
-        assert "burger" in result.extracted_items[0].item_name.lower()
+        logger.debug("   Item: %s", result.extracted_items[0].item_name)
         
-        print(f"   Item: {result.extracted_items[0].item_name}")
+        _EXPECTED_ONE_BURGER.assert_matches(result)
     
-    @pytest.mark.asyncio
-    async def test_quantity_variations(self):
+    @pytest.mark.parametrize("user_input,expected_qty", [
+        ("I want a burger", 1),
+        ("Give me two burgers", 2),
+        ("I'll have three burgers", 3),
+        pytest.param("Can I get a couple burgers", 2, marks=pytest.mark.xfail(reason="couple is fuzzy")),
+    ])
+    def test_quantity_variation(self, quantity_variation_results, user_input, expected_qty):
         """Test different ways of specifying quantity"""
+        result = quantity_variation_results[user_input]
         
-        test_cases = [
-            ("I want a burger", 1),
-            ("Give me two burgers", 2),
-            ("I'll have three burgers", 3),
-            ("Can I get a couple burgers", 2),
-        ]
-        
-        for user_input, expected_qty in test_cases:
-            result = await item_extraction_agent(
-                user_input=user_input,
-                context={
-                    "conversation_history": [],
-                    "order_state": {},
-                    "restaurant_id": "1"
-                }
-            )
-            
-            assert result.success is True
-            item = result.extracted_items[0]
-            print(f"   '{user_input}' -> Qty: {item.quantity} (expected: {expected_qty})")
-            
-            # Allow some flexibility for "couple" -> might be 2 or left as 1
-            if "couple" not in user_input:
-                assert item.quantity == expected_qty
-        
-        print(f"\n[SUCCESS] All quantity variations handled correctly")
-
+        logger.debug("   '%s' -> Qty: %s (expected: %s)", user_input, result.extracted_items[0].quantity, expected_qty)
+        ExpectedExtraction(items=[ExpectedItem(quantity=expected_qty)], exact_item_count=False).assert_matches(result)
@@ -6,12 +6,21 @@ This test uses:
 - Real database for validation
 - Real service logic for applying modifications
 - Tests the complex item splitting functionality we implemented
+
+Every agent call goes through the structured LLM disk cache, so with recordings
+in place `LLM_CACHE_MODE=once pytest ...` runs this file without an API key or
+network access (and fails on any request that was never recorded).
 """
 
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import pytest
 from decimal import Decimal
-from datetime import datetime
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 from app.workflow.agents.modify_item_agent import modify_item_agent
 from app.services.modify_item_service import ModifyItemService
 from app.models.restaurant import Restaurant
@@ -20,18 +29,163 @@ from app.models.menu_item import MenuItem
 from app.models.ingredient import Ingredient
 from app.models.menu_item_ingredient import MenuItemIngredient
 from app.constants.item_sizes import ItemSize
-from app.config.settings import settings
-from app.dto.conversation_dto import ConversationHistory, ConversationRole, ConversationEntry
+from app.tests.integration._fakes import FakeIngredientService, FakeMenuRepository
+from app.tests.integration._modify_item_scenarios import agent_requests, sample_order, second_burger_item
 
 
-# Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+logger = logging.getLogger(__name__)
 
+# Skip all tests if no OpenAI API key, unless replaying recorded responses only
+pytestmark = [pytest.mark.requires_openai, pytest.mark.llm_replayable]
 
-@pytest.fixture
+
+def _split_two_cheese_one_no_pickles(items):
+    """4 burgers became 2 with extra cheese, 1 with no pickles and 1 unchanged, each priced by its quantity"""
+    # One pass; the service writes ingredient modifications lowercase. (quantity, total price) per bucket
+    buckets = {"extra cheese": [], "no pickles": [], "unchanged": [], "other": []}
+    for item in items:
+        ingredient_modifications = item["modifications"].get("ingredient_modifications", "")
+        if "extra cheese" in ingredient_modifications:
+            bucket = "extra cheese"
+        elif "no pickles" in ingredient_modifications:
+            bucket = "no pickles"
+        else:
+            bucket = "other" if ingredient_modifications else "unchanged"
+        buckets[bucket].append((item["quantity"], item["total_price"]))
+    return buckets == {
+        "extra cheese": [(2, 20.0)],
+        "no pickles": [(1, 10.0)],
+        "unchanged": [(1, 10.0)],
+        "other": []
+    }
+
+
+def _ingredient_modifications(items):
+    """The single remaining line item's ingredient modifications (written lowercase by the service)"""
+    return items[0]["modifications"]["ingredient_modifications"] if len(items) == 1 else ""
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A request on the 4-burger order that the service should apply, and what each stage must show"""
+    user_input: str
+    expected_split: Optional[bool]  # None when either is acceptable
+    expected_mods: int  # exact count, or the minimum when a split is expected
+    check_message: Callable[[str], bool]  # given the lowercased service message
+    post_assertions: Callable[[List[Dict[str, Any]]], bool]  # given the order items after the service ran
+    check_agent: Callable[[Any], bool] = lambda agent_result: True
+
+
+SCENARIOS = [
+    # 4 sandwiches: modify 2 one way, 1 another way, leave 1 alone
+    Scenario(
+        user_input="Make 2 of those burgers extra cheese and 1 with no pickles",
+        expected_split=True,
+        expected_mods=2,
+        check_agent=lambda agent_result: agent_result.remaining_unchanged == 1,
+        check_message=lambda message: "extra cheese" in message and "no pickles" in message,
+        post_assertions=_split_two_cheese_one_no_pickles
+    ),
+    Scenario(
+        user_input="No pickles on the burger",
+        expected_split=False,
+        expected_mods=1,
+        check_message=lambda message: "pickles" in message,
+        post_assertions=lambda items: "no pickles" in _ingredient_modifications(items)
+    ),
+    # The agent recognizes this as a simple quantity change, not a split
+    Scenario(
+        user_input="I only want 2 burgers total",
+        expected_split=False,
+        expected_mods=1,
+        check_message=lambda message: "quantity" in message or "two" in message,
+        post_assertions=lambda items: len(items) == 1 and items[0]["quantity"] == 2 and items[0]["total_price"] == 20.0
+    ),
+    # Applies to every burger, so nothing is split off
+    Scenario(
+        user_input="Make all the burgers extra cheese",
+        expected_split=False,
+        expected_mods=1,
+        check_message=lambda message: "cheese" in message,
+        post_assertions=lambda items: "extra cheese" in _ingredient_modifications(items) and items[0]["quantity"] == 4
+    ),
+    Scenario(
+        user_input="Make the burger large",
+        expected_split=None,
+        expected_mods=1,
+        check_agent=lambda agent_result: "large" in agent_result.modifications[0].modification.lower(),
+        check_message=lambda message: "large" in message,
+        post_assertions=lambda items: True
+    ),
+]
+
+
+def _restrict_max_quantity(monkeypatch):
+    """Mock only the MenuItem lookup, returning a quantity limit (10) below the requested 100"""
+    monkeypatch.setattr(MenuItem, "get_or_none", AsyncMock(return_value=SimpleNamespace(max_quantity=10)))
+
+
+@dataclass(frozen=True)
+class RejectedScenario:
+    """A request on the 4-burger order that the agent parses but the service must reject"""
+    user_input: str
+    expected_split: Optional[bool]  # None when either is acceptable
+    expected_mods: Optional[int]  # None for at least one
+    check_message: Callable[[str], bool]  # given the service message
+    patches: Tuple[Callable[[pytest.MonkeyPatch], None], ...] = ()
+
+
+REJECTED_SCENARIOS = [
+    # Quantity change that exceeds business limits
+    RejectedScenario(
+        user_input="Change the quantity to 100",
+        expected_split=False,
+        expected_mods=1,
+        check_message=lambda message: "Cannot order" in message or "Maximum allowed" in message,
+        patches=(_restrict_max_quantity,)
+    ),
+    # Ingredient that isn't on the menu
+    RejectedScenario(
+        user_input="Make the burger with unicorn meat",
+        expected_split=False,
+        expected_mods=1,
+        check_message=lambda message: "not available" in message.lower() or "not found" in message.lower()
+    ),
+    # Both an invalid ingredient and an excessive quantity
+    RejectedScenario(
+        user_input="Make the burger with unicorn meat and change quantity to 100",
+        expected_split=None,
+        expected_mods=None,
+        check_message=lambda message: True,
+        patches=(_restrict_max_quantity,)
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+async def agent_result_cache(module_structured_agent_cache):
+    """
+    Every test's modify_item_agent call, made concurrently up front and keyed by user input.
+
+    The service mutates the results it applies, so tests take a deep copy.
+    """
+    requests = agent_requests()
+    results = await asyncio.gather(*[
+        modify_item_agent(
+            user_input=user_input,
+            current_order=current_order,
+            conversation_history=conversation_history
+        )
+        for user_input, (current_order, conversation_history) in requests.items()
+    ])
+    return dict(zip(requests, results))
+
+
+# The service only reads the menu, so the database and sample menu are built once per module
+# and shared by the tests that use them; check_shared_menu guards that. Tests that only need
+# validation use fake_menu instead and never start the ORM.
+
+@pytest.fixture(scope="module")
 async def db():
     """Initialize test database"""
     from tortoise import Tortoise
@@ -44,7 +198,7 @@ async def db():
     await Tortoise.close_connections()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def sample_restaurant(db):
     """Create a sample restaurant for testing"""
     return await Restaurant.create(
@@ -55,7 +209,7 @@ async def sample_restaurant(db):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def sample_category(db, sample_restaurant):
     """Create a sample category for testing"""
     return await Category.create(
@@ -65,7 +219,7 @@ async def sample_category(db, sample_restaurant):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def sample_menu_items(db, sample_category, sample_restaurant):
     """Create sample menu items with modification options"""
     
@@ -98,456 +252,268 @@ async def sample_menu_items(db, sample_category, sample_restaurant):
     return [burger, fries]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def sample_ingredients(db, sample_restaurant):
     """Create sample ingredients"""
     
-    # Create ingredients
-    pickles = await Ingredient.create(
-        name="Pickles",
-        restaurant=sample_restaurant,
-        is_optional=True
-    )
-    
-    cheese = await Ingredient.create(
-        name="Cheese",
-        restaurant=sample_restaurant,
-        is_optional=True
-    )
-    
-    mayo = await Ingredient.create(
-        name="Mayo",
-        restaurant=sample_restaurant,
-        is_optional=True
-    )
+    # One INSERT for all three; SQLite bulk inserts don't hand back primary keys, so read them back
+    await Ingredient.bulk_create([
+        Ingredient(name="Pickles", restaurant=sample_restaurant, is_optional=True),
+        Ingredient(name="Cheese", restaurant=sample_restaurant, is_optional=True),
+        Ingredient(name="Mayo", restaurant=sample_restaurant, is_optional=True)
+    ])
+    pickles, cheese, mayo = await Ingredient.filter(restaurant=sample_restaurant).order_by("id")
     
     return [pickles, cheese, mayo]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def sample_menu_item_ingredients(db, sample_menu_items, sample_ingredients):
     """Create menu item ingredients"""
     
     burger, fries = sample_menu_items
     pickles, cheese, mayo = sample_ingredients
     
-    # Create menu item ingredients
-    await MenuItemIngredient.create(
-        menu_item=burger,
-        ingredient=pickles,
-        quantity=Decimal('2.0'),
-        unit="pieces",
-        is_optional=True,
-        additional_cost=Decimal('0.00')
-    )
-    
-    await MenuItemIngredient.create(
-        menu_item=burger,
-        ingredient=cheese,
-        quantity=Decimal('1.0'),
-        unit="slice",
-        is_optional=True,
-        additional_cost=Decimal('0.50')
-    )
-    
-    await MenuItemIngredient.create(
-        menu_item=burger,
-        ingredient=mayo,
-        quantity=Decimal('1.0'),
-        unit="tbsp",
-        is_optional=True,
-        additional_cost=Decimal('0.25')
-    )
+    # Create menu item ingredients in one INSERT
+    await MenuItemIngredient.bulk_create([
+        MenuItemIngredient(
+            menu_item=burger,
+            ingredient=pickles,
+            quantity=Decimal('2.0'),
+            unit="pieces",
+            is_optional=True,
+            additional_cost=Decimal('0.00')
+        ),
+        MenuItemIngredient(
+            menu_item=burger,
+            ingredient=cheese,
+            quantity=Decimal('1.0'),
+            unit="slice",
+            is_optional=True,
+            additional_cost=Decimal('0.50')
+        ),
+        MenuItemIngredient(
+            menu_item=burger,
+            ingredient=mayo,
+            quantity=Decimal('1.0'),
+            unit="tbsp",
+            is_optional=True,
+            additional_cost=Decimal('0.25')
+        )
+    ])
     
     return [burger, fries]
 
 
-@pytest.fixture
-def sample_redis_order():
-    """Sample Redis order data with 4 sandwiches"""
-    return {
-        "id": "order_1234567890",
-        "session_id": "session_123",
-        "restaurant_id": 1,
-        "status": "active",
-        "items": [
-            {
-                "id": "item_1234567890",
-                "menu_item_id": 1,  # Burger
-                "quantity": 4,  # 4 sandwiches
-                "modifications": {
-                    "size": "regular",
-                    "name": "Burger",
-                    "unit_price": 10.0,
-                    "total_price": 40.0,  # 4 * 10.0
-                    "ingredient_modifications": "",
-                    "special_instructions": ""
-                },
-                "added_at": "2024-01-01T12:00:00"
-            }
-        ]
-    }
+@pytest.fixture(scope="module")
+def fake_menu():
+    """The sample menu in memory, for tests that only need the service's validation"""
+    menu = FakeMenuRepository()
+    menu.add_menu_item(1, "Burger", max_quantity=5)
+    menu.add_menu_item(2, "Fries", max_quantity=10)
+    for name in ("Pickles", "Cheese", "Mayo"):
+        menu.add_ingredient(name, is_optional=True)
+    return menu
+
+
+@pytest.fixture(scope="module")
+def fake_ingredient_service():
+    """The sample menu's ingredients, for tests that validate through the ingredient service"""
+    return FakeIngredientService(restaurant_id=1, names=("Cheese", "Pickles", "Mayo"))
 
 
 @pytest.fixture
-def sample_conversation_history():
-    """Sample conversation history"""
-    history = ConversationHistory(session_id="test_session")
-    history.add_entry(ConversationRole.USER, "I want a burger")
-    history.add_entry(ConversationRole.ASSISTANT, "Added burger to your order")
-    history.add_entry(ConversationRole.USER, "And some fries")
-    history.add_entry(ConversationRole.ASSISTANT, "Added fries to your order")
-    return history
+def sample_redis_order():
+    """Sample Redis order data with 4 sandwiches"""
+    return sample_order()
 
 
 class TestComplexModifyScenario:
     """Integration test for complex modify item scenario with item splitting"""
     
+    @pytest.fixture(autouse=True)
+    async def check_shared_menu(self, request):
+        """Fail if a test writes to the shared menu data"""
+        if "db" not in request.fixturenames:
+            yield
+            return
+        request.getfixturevalue("sample_menu_item_ingredients")
+        yield
+        assert await MenuItem.all().count() == 2
+        assert await Ingredient.all().count() == 3
+        assert await MenuItemIngredient.all().count() == 3
+    
     @pytest.mark.asyncio
-    async def test_complex_item_splitting_scenario(
-        self, 
+    @pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda scenario: scenario.user_input[:30])
+    async def test_scenario(
+        self,
+        scenario,
         sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients
+        agent_result_cache,
+        fake_menu
     ):
         """
-        Test complex scenario: 4 sandwiches, modify 2 one way, 1 another way, leave 1 alone
-        
-        This tests the enhanced agent + service integration with:
-        - Real LLM parsing of complex natural language
-        - Real validation against database
-        - Real item splitting logic
-        - Real modification application
+        Test the real agent's parse of each request is applied by the real service:
+        LLM parsing, validation against the menu, item splitting and modification
         """
         
-        # Test input: "Make 2 of those burgers extra cheese and 1 with no pickles"
-        user_input = "Make 2 of those burgers extra cheese and 1 with no pickles"
-        
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
-        
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        logger.debug("[TEST INPUT] '%s'", scenario.user_input)
+        logger.debug("[INITIAL ORDER] %s", sample_redis_order['items'])
         
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Requires Split: {agent_result.requires_split}")
-        print(f"  Remaining Unchanged: {agent_result.remaining_unchanged}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[scenario.user_input].model_copy(deep=True)
         
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Requires Split: %s", agent_result.requires_split)
+        logger.debug("  Remaining Unchanged: %s", agent_result.remaining_unchanged)
         for i, mod in enumerate(agent_result.modifications):
-            print(f"    Modification {i+1}: {mod.quantity}x {mod.item_name} - {mod.modification}")
-        
-        # Verify agent result
-        assert agent_result.success is True
-        assert agent_result.requires_split is True
-        assert len(agent_result.modifications) >= 2  # Should have at least 2 modifications
-        assert agent_result.remaining_unchanged == 1  # 1 should remain unchanged
-        
-        # Run real service
-        service = ModifyItemService()
-        service_result = await service.apply_modification(agent_result, sample_redis_order)
-        
-        print(f"\n[SERVICE OUTPUT]")
-        print(f"  Success: {service_result.success}")
-        print(f"  Message: {service_result.message}")
-        print(f"  Modified Fields: {service_result.modified_fields}")
-        
-        # Verify service result
-        assert service_result.success is True
-        assert "extra cheese" in service_result.message.lower()
-        assert "no pickles" in service_result.message.lower()
-        
-        # Verify the order was actually split and modified
-        print(f"\n[FINAL ORDER] {sample_redis_order['items']}")
-        
-        # Should have 3 items now (2 modified + 1 unchanged)
-        assert len(sample_redis_order["items"]) == 3
-        
-        # Find the items
-        items = sample_redis_order["items"]
-        
-        # Count items by modification type
-        extra_cheese_items = [item for item in items if "extra cheese" in item["modifications"].get("ingredient_modifications", "").lower()]
-        no_pickles_items = [item for item in items if "no pickles" in item["modifications"].get("ingredient_modifications", "").lower()]
-        unchanged_items = [item for item in items if not item["modifications"].get("ingredient_modifications", "")]
-        
-        print(f"\n[VERIFICATION]")
-        print(f"  Extra cheese items: {len(extra_cheese_items)}")
-        print(f"  No pickles items: {len(no_pickles_items)}")
-        print(f"  Unchanged items: {len(unchanged_items)}")
-        
-        # Verify quantities
-        assert len(extra_cheese_items) == 1
-        assert extra_cheese_items[0]["quantity"] == 2
-        assert extra_cheese_items[0]["total_price"] == 20.0  # 2 * 10.0
-        
-        assert len(no_pickles_items) == 1
-        assert no_pickles_items[0]["quantity"] == 1
-        assert no_pickles_items[0]["total_price"] == 10.0  # 1 * 10.0
-        
-        assert len(unchanged_items) == 1
-        assert unchanged_items[0]["quantity"] == 1
-        assert unchanged_items[0]["total_price"] == 10.0  # 1 * 10.0
-        
-        # Verify total quantity is still 4
-        total_quantity = sum(item["quantity"] for item in items)
-        assert total_quantity == 4
-        
-        print(f"\n[SUCCESS] Complex item splitting scenario completed successfully!")
-        print(f"  Total items: {len(items)}")
-        print(f"  Total quantity: {total_quantity}")
-        print(f"  Extra cheese: {extra_cheese_items[0]['quantity']} items")
-        print(f"  No pickles: {no_pickles_items[0]['quantity']} items")
-        print(f"  Unchanged: {unchanged_items[0]['quantity']} items")
-    
-    @pytest.mark.asyncio
-    async def test_simple_ingredient_modification(
-        self, 
-        sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients
-    ):
-        """Test simple ingredient modification on single item"""
-        
-        # Test input: Simple modification
-        user_input = "No pickles on the burger"
-        
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
-        
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
-        
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Requires Split: {agent_result.requires_split}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
+            logger.debug("    Modification %s: %sx %s - %s", i + 1, mod.quantity, mod.item_name, mod.modification)
         
         # Verify agent result
         assert agent_result.success is True
-        assert agent_result.requires_split is False  # Should be simple modification
-        assert len(agent_result.modifications) == 1
-        
-        # Run real service
-        service = ModifyItemService()
-        service_result = await service.apply_modification(agent_result, sample_redis_order)
-        
-        print(f"\n[SERVICE OUTPUT]")
-        print(f"  Success: {service_result.success}")
-        print(f"  Message: {service_result.message}")
-        
-        # Verify service result
-        assert service_result.success is True
-        assert "pickles" in service_result.message.lower()
-        
-        # Verify the order was modified (should still be 1 item)
-        assert len(sample_redis_order["items"]) == 1
-        burger_item = sample_redis_order["items"][0]
-        assert "no pickles" in burger_item["modifications"]["ingredient_modifications"].lower()
-        
-        print(f"\n[SUCCESS] Simple ingredient modification completed!")
-        print(f"  Final modifications: {burger_item['modifications']['ingredient_modifications']}")
-    
-    @pytest.mark.asyncio
-    async def test_simple_quantity_modification(
-        self, 
-        sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients
-    ):
-        """Test simple quantity modification on single item"""
-        
-        # Test input: Simple quantity change
-        user_input = "I only want 2 burgers total"
-        
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
-        
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
-        
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Requires Split: {agent_result.requires_split}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
-        
-        # Verify agent result
-        assert agent_result.success is True
-        # The agent now correctly recognizes this as a simple quantity change
-        assert agent_result.requires_split is False
-        assert len(agent_result.modifications) == 1
+        if scenario.expected_split is not None:
+            assert agent_result.requires_split is scenario.expected_split
+        if scenario.expected_split:
+            assert len(agent_result.modifications) >= scenario.expected_mods
+        else:
+            assert len(agent_result.modifications) == scenario.expected_mods
+        assert scenario.check_agent(agent_result)
         
-        # Run real service
-        service = ModifyItemService()
+        # Run real service, validating against the in-memory menu
+        service = fake_menu.service()
         service_result = await service.apply_modification(agent_result, sample_redis_order)
         
-        print(f"\n[SERVICE OUTPUT]")
-        print(f"  Success: {service_result.success}")
-        print(f"  Message: {service_result.message}")
+        logger.debug("[SERVICE OUTPUT]")
+        logger.debug("  Success: %s", service_result.success)
+        logger.debug("  Message: %s", service_result.message)
+        logger.debug("  Modified Fields: %s", service_result.modified_fields)
+        logger.debug("[FINAL ORDER] %s", sample_redis_order['items'])
         
-        # Verify service result
+        # Verify service result and the updated order
         assert service_result.success is True
-        assert "quantity" in service_result.message.lower() or "two" in service_result.message.lower()
-        
-        # Verify the order was modified (should still be 1 item with quantity 2)
-        assert len(sample_redis_order["items"]) == 1
-        burger_item = sample_redis_order["items"][0]
-        assert burger_item["quantity"] == 2
-        assert burger_item["total_price"] == 20.0  # 2 * 10.0
-        
-        print(f"\n[SUCCESS] Simple quantity modification completed!")
-        print(f"  Final quantity: {burger_item['quantity']}")
-        print(f"  Final total price: {burger_item['total_price']}")
+        assert scenario.check_message(service_result.message.lower()), service_result.message
+        assert scenario.post_assertions(sample_redis_order["items"]), sample_redis_order["items"]
     
     @pytest.mark.asyncio
-    async def test_all_items_modification(
-        self, 
+    @pytest.mark.parametrize("scenario", REJECTED_SCENARIOS, ids=lambda scenario: scenario.user_input[:30])
+    async def test_rejected_scenario(
+        self,
+        scenario,
         sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients
+        agent_result_cache,
+        fake_ingredient_service,
+        sample_menu_item_ingredients,
+        db,
+        monkeypatch
     ):
-        """Test modification applied to all items (no splitting needed)"""
-        
-        # Test input: Modify all items
-        user_input = "Make all the burgers extra cheese"
+        """Test the real agent parses each request and the real service rejects it with validation errors"""
         
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
+        logger.debug("[TEST INPUT] '%s'", scenario.user_input)
+        logger.debug("[INITIAL ORDER] %s", sample_redis_order['items'])
         
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[scenario.user_input].model_copy(deep=True)
         
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Requires Split: {agent_result.requires_split}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Requires Split: %s", agent_result.requires_split)
+        logger.debug("  Modifications: %s", len(agent_result.modifications))
         
-        # Verify agent result
+        # Agent should parse the request
         assert agent_result.success is True
-        assert agent_result.requires_split is False  # Should be simple modification (all items)
-        assert len(agent_result.modifications) == 1
+        if scenario.expected_split is not None:
+            assert agent_result.requires_split is scenario.expected_split
+        if scenario.expected_mods is None:
+            assert len(agent_result.modifications) >= 1
+        else:
+            assert len(agent_result.modifications) == scenario.expected_mods
         
-        # Run real service
-        service = ModifyItemService()
+        # Run real service (should fail validation); ingredient lookups only know cheese, pickles and mayo
+        for apply_patch in scenario.patches:
+            apply_patch(monkeypatch)
+        service = ModifyItemService(ingredient_service=fake_ingredient_service)
         service_result = await service.apply_modification(agent_result, sample_redis_order)
         
-        print(f"\n[SERVICE OUTPUT]")
-        print(f"  Success: {service_result.success}")
-        print(f"  Message: {service_result.message}")
+        logger.debug("[SERVICE OUTPUT]")
+        logger.debug("  Success: %s", service_result.success)
+        logger.debug("  Message: %s", service_result.message)
+        logger.debug("  Validation Errors: %s", service_result.validation_errors)
         
-        # Verify service result
-        assert service_result.success is True
-        assert "cheese" in service_result.message.lower()
-        
-        # Verify the order was modified (should still be 1 item)
-        assert len(sample_redis_order["items"]) == 1
-        burger_item = sample_redis_order["items"][0]
-        assert "extra cheese" in burger_item["modifications"]["ingredient_modifications"].lower()
-        assert burger_item["quantity"] == 4  # Should remain 4 (all items modified)
-        
-        print(f"\n[SUCCESS] All items modification completed!")
-        print(f"  Final quantity: {burger_item['quantity']}")
-        print(f"  Final modifications: {burger_item['modifications']['ingredient_modifications']}")
+        assert service_result.success is False
+        assert scenario.check_message(service_result.message), service_result.message
+        assert len(service_result.validation_errors) > 0
     
     @pytest.mark.asyncio
     async def test_modify_nonexistent_item(
         self, 
         sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients
+        agent_result_cache,
+        fake_menu
     ):
         """Test modification of item that doesn't exist in order"""
         
         # Test input: Try to modify something not in the order
         user_input = "Make the pizza extra cheese"
         
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
+        logger.debug("[TEST INPUT] '%s'", user_input)
+        logger.debug("[INITIAL ORDER] %s", sample_redis_order['items'])
         
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
         
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Clarification Needed: {agent_result.clarification_needed}")
-        print(f"  Clarification Message: {agent_result.clarification_message}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Clarification Needed: %s", agent_result.clarification_needed)
+        logger.debug("  Clarification Message: %s", agent_result.clarification_message)
         
         # The agent should either ask for clarification or fail gracefully
         # It might not find the item and ask for clarification
         if agent_result.clarification_needed:
-            print(f"\n[SUCCESS] Agent correctly asked for clarification!")
-            print(f"  Message: {agent_result.clarification_message}")
+            logger.debug("[SUCCESS] Agent correctly asked for clarification!")
+            logger.debug("  Message: %s", agent_result.clarification_message)
             assert agent_result.clarification_needed is True
             assert agent_result.clarification_message is not None
         else:
             # If agent thinks it found something, the service should handle it
-            service = ModifyItemService()
+            service = fake_menu.service()
             service_result = await service.apply_modification(agent_result, sample_redis_order)
             
-            print(f"\n[SERVICE OUTPUT]")
-            print(f"  Success: {service_result.success}")
-            print(f"  Message: {service_result.message}")
+            logger.debug("[SERVICE OUTPUT]")
+            logger.debug("  Success: %s", service_result.success)
+            logger.debug("  Message: %s", service_result.message)
             
             # Service should fail because item doesn't exist
             assert service_result.success is False
             assert "not found" in service_result.message.lower() or "does not exist" in service_result.message.lower()
             
-            print(f"\n[SUCCESS] Service correctly rejected modification of nonexistent item!")
+            logger.debug("[SUCCESS] Service correctly rejected modification of nonexistent item!")
     
     @pytest.mark.asyncio
     async def test_modify_legitimate_menu_item_not_in_order(
         self,
         sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
+        agent_result_cache
     ):
         """Test modification of legitimate menu item that's not in current order"""
         
         # Test input: Try to modify fries (which exists on menu but not in order)
         user_input = "Make the fries with bacon"
         
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
+        logger.debug("[TEST INPUT] '%s'", user_input)
+        logger.debug("[INITIAL ORDER] %s", sample_redis_order['items'])
         
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
         
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Clarification Needed: {agent_result.clarification_needed}")
-        print(f"  Clarification Message: {agent_result.clarification_message}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Clarification Needed: %s", agent_result.clarification_needed)
+        logger.debug("  Clarification Message: %s", agent_result.clarification_message)
         
         # The agent should ask for clarification since fries isn't in the order
         assert agent_result.clarification_needed is True
@@ -555,57 +521,40 @@ class TestComplexModifyScenario:
         assert "fries" in agent_result.clarification_message.lower()
         assert "in your current order" in agent_result.clarification_message.lower()
         
-        print(f"\n[SUCCESS] Agent correctly asked for clarification!")
-        print(f"  Message: {agent_result.clarification_message}")
+        logger.debug("[SUCCESS] Agent correctly asked for clarification!")
+        logger.debug("  Message: %s", agent_result.clarification_message)
     
     @pytest.mark.asyncio
     async def test_ambiguous_item_reference(
         self, 
         sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients
+        agent_result_cache,
+        fake_menu
     ):
         """Test ambiguous item reference that could match multiple items"""
         
         # Add another burger to the order to create ambiguity
-        sample_redis_order["items"].append({
-            "id": "item_1234567891",
-            "menu_item_id": 1,  # Same menu item ID
-            "quantity": 2,
-            "modifications": {
-                "size": "large",
-                "name": "Burger",
-                "unit_price": 12.0,
-                "total_price": 24.0,
-                "ingredient_modifications": "",
-                "special_instructions": ""
-            },
-            "added_at": "2024-01-01T12:02:00"
-        })
+        sample_redis_order["items"].append(second_burger_item())
         
         # Test input: Ambiguous reference
         user_input = "Make that burger extra cheese"
         
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
+        logger.debug("[TEST INPUT] '%s'", user_input)
+        logger.debug("[INITIAL ORDER] %s", sample_redis_order['items'])
         
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
         
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Clarification Needed: {agent_result.clarification_needed}")
-        print(f"  Clarification Message: {agent_result.clarification_message}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Clarification Needed: %s", agent_result.clarification_needed)
+        logger.debug("  Clarification Message: %s", agent_result.clarification_message)
         
         # Agent should ask for clarification due to ambiguity
         if agent_result.clarification_needed:
-            print(f"\n[SUCCESS] Agent correctly identified ambiguity!")
-            print(f"  Message: {agent_result.clarification_message}")
+            logger.debug("[SUCCESS] Agent correctly identified ambiguity!")
+            logger.debug("  Message: %s", agent_result.clarification_message)
             assert agent_result.clarification_needed is True
             assert "which" in agent_result.clarification_message.lower() or "burger" in agent_result.clarification_message.lower()
         else:
@@ -614,230 +563,35 @@ class TestComplexModifyScenario:
             assert len(agent_result.modifications) == 1
             
             # Service should apply to the most recent item
-            service = ModifyItemService()
+            service = fake_menu.service()
             service_result = await service.apply_modification(agent_result, sample_redis_order)
             
-            print(f"\n[SERVICE OUTPUT]")
-            print(f"  Success: {service_result.success}")
-            print(f"  Message: {service_result.message}")
+            logger.debug("[SERVICE OUTPUT]")
+            logger.debug("  Success: %s", service_result.success)
+            logger.debug("  Message: %s", service_result.message)
             
             assert service_result.success is True
-            print(f"\n[SUCCESS] Agent chose most recent item for modification!")
-    
-    @pytest.mark.asyncio
-    async def test_quantity_exceeds_limits(
-        self,
-        sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
-    ):
-        """Test quantity change that exceeds business limits"""
-        
-        # Test input: Try to set quantity to something very high
-        user_input = "Change the quantity to 100"
-        
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
-        
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
-        
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Requires Split: {agent_result.requires_split}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
-        
-        # Agent should parse the request
-        assert agent_result.success is True
-        assert agent_result.requires_split is False
-        assert len(agent_result.modifications) == 1
-        
-        # Run real service (should fail validation)
-        # Mock MenuItem model to return restrictive quantity limits
-        with patch('app.models.menu_item.MenuItem') as mock_menu_item_class:
-            # Create mock menu item with low max_quantity
-            mock_menu_item = MagicMock()
-            mock_menu_item.max_quantity = 10  # Lower than requested 100
-            
-            async def mock_get_or_none(*args, **kwargs):
-                return mock_menu_item
-            mock_menu_item_class.get_or_none = mock_get_or_none
-            
-            service = ModifyItemService()
-            service_result = await service.apply_modification(agent_result, sample_redis_order)
-            
-            print(f"\n[SERVICE OUTPUT]")
-            print(f"  Success: {service_result.success}")
-            print(f"  Message: {service_result.message}")
-            print(f"  Validation Errors: {service_result.validation_errors}")
-            
-            # Service should fail due to quantity validation
-            assert service_result.success is False
-            assert "Cannot order" in service_result.message or "Maximum allowed" in service_result.message
-            assert len(service_result.validation_errors) > 0
-        
-        print(f"\n[SUCCESS] Service correctly rejected excessive quantity!")
+            logger.debug("[SUCCESS] Agent chose most recent item for modification!")
     
-    @pytest.mark.asyncio
-    async def test_nonexistent_ingredient_modification(
-        self,
-        sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
-    ):
-        """Test modification with ingredient that doesn't exist"""
-        
-        # Test input: Try to add ingredient that doesn't exist
-        user_input = "Make the burger with unicorn meat"
-        
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
-        
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
-        
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Requires Split: {agent_result.requires_split}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
-        
-        # Agent should parse the request
-        assert agent_result.success is True
-        assert agent_result.requires_split is False
-        assert len(agent_result.modifications) == 1
-        
-        # Run real service (should fail validation)
-        # Mock ingredient service to return only valid ingredients (no "unicorn meat")
-        mock_ingredient_service = MagicMock()
-        mock_ingredient_list = MagicMock()
-        
-        # Create mock ingredients (only valid ones: cheese, pickles, mayo)
-        mock_cheese = MagicMock()
-        mock_cheese.name = "Cheese"
-        mock_pickles = MagicMock()
-        mock_pickles.name = "Pickles"
-        mock_mayo = MagicMock()
-        mock_mayo.name = "Mayo"
-        
-        mock_ingredient_list.ingredients = [mock_cheese, mock_pickles, mock_mayo]
-        
-        async def mock_get_by_restaurant(*args, **kwargs):
-            return mock_ingredient_list
-        mock_ingredient_service.get_by_restaurant = mock_get_by_restaurant
-        
-        # Create service with mocked dependencies
-        service = ModifyItemService(ingredient_service=mock_ingredient_service)
-        
-        # Debug: Test ingredient validation directly
-        print(f"\n[DEBUG] Testing ingredient validation directly...")
-        modification = agent_result.modifications[0]
-        ingredient_error = await service._validate_ingredients(modification, sample_redis_order)
-        print(f"  Ingredient validation error: {ingredient_error}")
-        
-        service_result = await service.apply_modification(agent_result, sample_redis_order)
-        
-        print(f"\n[SERVICE OUTPUT]")
-        print(f"  Success: {service_result.success}")
-        print(f"  Message: {service_result.message}")
-        print(f"  Validation Errors: {service_result.validation_errors}")
-        
-        # Service should fail due to ingredient validation
-        assert service_result.success is False
-        assert "not available" in service_result.message.lower() or "not found" in service_result.message.lower()
-        assert len(service_result.validation_errors) > 0
-        
-        print(f"\n[SUCCESS] Service correctly rejected nonexistent ingredient!")
-
     @pytest.mark.asyncio
     async def test_multiple_items_order_targeting(
         self,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
+        agent_result_cache
     ):
         """Test modification targeting specific items in a multi-item order"""
 
-        # Create a multi-item order
-        multi_item_order = {
-            "id": "order_1234567890",
-            "session_id": "session_123",
-            "restaurant_id": 1,
-            "status": "active",
-            "items": [
-                {
-                    "id": "item_111",
-                    "menu_item_id": 1,
-                    "quantity": 2,
-                    "modifications": {
-                        "size": "regular",
-                        "name": "Burger",
-                        "unit_price": 10.0,
-                        "total_price": 20.0,
-                        "ingredient_modifications": "",
-                        "special_instructions": ""
-                    },
-                    "added_at": "2024-01-01T12:00:00"
-                },
-                {
-                    "id": "item_222",
-                    "menu_item_id": 2,
-                    "quantity": 1,
-                    "modifications": {
-                        "size": "large",
-                        "name": "Fries",
-                        "unit_price": 5.0,
-                        "total_price": 5.0,
-                        "ingredient_modifications": "",
-                        "special_instructions": ""
-                    },
-                    "added_at": "2024-01-01T12:01:00"
-                },
-                {
-                    "id": "item_333",
-                    "menu_item_id": 3,
-                    "quantity": 1,
-                    "modifications": {
-                        "size": "medium",
-                        "name": "Drink",
-                        "unit_price": 3.0,
-                        "total_price": 3.0,
-                        "ingredient_modifications": "",
-                        "special_instructions": ""
-                    },
-                    "added_at": "2024-01-01T12:02:00"
-                }
-            ]
-        }
-
         # Test input: Target specific items in multi-item order
         user_input = "Make the burger extra cheese and the fries extra salty"
 
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[MULTI-ITEM ORDER] {len(multi_item_order['items'])} items")
+        logger.debug("[TEST INPUT] '%s'", user_input)
 
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=multi_item_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
 
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Modifications: %s", len(agent_result.modifications))
 
         # Agent should parse both modifications
         assert agent_result.success is True
@@ -852,133 +606,14 @@ class TestComplexModifyScenario:
         assert burger_mod.item_id == "item_111"  # Burger item ID
         assert fries_mod.item_id == "item_222"   # Fries item ID
 
-        print(f"\n[SUCCESS] Agent correctly targeted specific items in multi-item order!")
-
-    @pytest.mark.asyncio
-    async def test_size_modification(
-        self,
-        sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
-    ):
-        """Test size modification functionality"""
-
-        # Test input: Change size
-        user_input = "Make the burger large"
-
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
-
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
-
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
-
-        # Agent should parse the size change
-        assert agent_result.success is True
-        assert len(agent_result.modifications) == 1
-        assert "large" in agent_result.modifications[0].modification.lower()
-
-        # Run real service
-        service = ModifyItemService()
-        service_result = await service.apply_modification(agent_result, sample_redis_order)
-
-        print(f"\n[SERVICE OUTPUT]")
-        print(f"  Success: {service_result.success}")
-        print(f"  Message: {service_result.message}")
-
-        # Service should handle size modification
-        assert service_result.success is True
-        assert "large" in service_result.message.lower()
-
-        print(f"\n[SUCCESS] Size modification worked!")
-
-    @pytest.mark.asyncio
-    async def test_mixed_validation_failures(
-        self,
-        sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
-    ):
-        """Test multiple validation failures in one request"""
-
-        # Test input: Both invalid ingredient and excessive quantity
-        user_input = "Make the burger with unicorn meat and change quantity to 100"
-
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
-
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
-
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
-
-        # Agent should parse both modifications
-        assert agent_result.success is True
-        assert len(agent_result.modifications) >= 1
-
-        # Run real service with mocked ingredient service
-        mock_ingredient_service = MagicMock()
-        mock_ingredient_list = MagicMock()
-        
-        # Create mock ingredients (only valid ones: cheese, pickles, mayo)
-        mock_cheese = MagicMock()
-        mock_cheese.name = "Cheese"
-        mock_pickles = MagicMock()
-        mock_pickles.name = "Pickles"
-        mock_mayo = MagicMock()
-        mock_mayo.name = "Mayo"
-        
-        mock_ingredient_list.ingredients = [mock_cheese, mock_pickles, mock_mayo]
-        
-        async def mock_get_by_restaurant(*args, **kwargs):
-            return mock_ingredient_list
-        mock_ingredient_service.get_by_restaurant = mock_get_by_restaurant
-        
-        # Mock MenuItem model to return restrictive quantity limits
-        with patch('app.models.menu_item.MenuItem') as mock_menu_item_class:
-            mock_menu_item = MagicMock()
-            mock_menu_item.max_quantity = 10  # Lower than requested 100
-            
-            async def mock_get_or_none(*args, **kwargs):
-                return mock_menu_item
-            mock_menu_item_class.get_or_none = mock_get_or_none
-            
-            service = ModifyItemService(ingredient_service=mock_ingredient_service)
-            service_result = await service.apply_modification(agent_result, sample_redis_order)
-            
-            print(f"\n[SERVICE OUTPUT]")
-            print(f"  Success: {service_result.success}")
-            print(f"  Message: {service_result.message}")
-            print(f"  Validation Errors: {service_result.validation_errors}")
-            
-            # Service should fail due to multiple validation issues
-            assert service_result.success is False
-            assert len(service_result.validation_errors) > 0
-
-        print(f"\n[SUCCESS] Service correctly handled multiple validation failures!")
+        logger.debug("[SUCCESS] Agent correctly targeted specific items in multi-item order!")
 
     @pytest.mark.asyncio
     async def test_partial_success_scenario(
         self,
         sample_redis_order,
-        sample_conversation_history,
+        agent_result_cache,
+        fake_ingredient_service,
         sample_menu_item_ingredients,
         db
     ):
@@ -987,122 +622,56 @@ class TestComplexModifyScenario:
         # Test input: Mix of valid and invalid ingredients
         user_input = "Make the burger extra cheese and extra unicorn meat"
 
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
+        logger.debug("[TEST INPUT] '%s'", user_input)
+        logger.debug("[INITIAL ORDER] %s", sample_redis_order['items'])
 
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
 
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Modifications: %s", len(agent_result.modifications))
 
         # Agent should parse the modifications
         assert agent_result.success is True
         assert len(agent_result.modifications) >= 1
 
-        # Run real service with mocked ingredient service
-        mock_ingredient_service = MagicMock()
-        mock_ingredient_list = MagicMock()
-        
-        # Create mock ingredients (only valid ones: cheese, pickles, mayo)
-        mock_cheese = MagicMock()
-        mock_cheese.name = "Cheese"
-        mock_pickles = MagicMock()
-        mock_pickles.name = "Pickles"
-        mock_mayo = MagicMock()
-        mock_mayo.name = "Mayo"
-        
-        mock_ingredient_list.ingredients = [mock_cheese, mock_pickles, mock_mayo]
-        
-        async def mock_get_by_restaurant(*args, **kwargs):
-            return mock_ingredient_list
-        mock_ingredient_service.get_by_restaurant = mock_get_by_restaurant
-        
-        service = ModifyItemService(ingredient_service=mock_ingredient_service)
+        # Run real service with the fake ingredient service
+        service = ModifyItemService(ingredient_service=fake_ingredient_service)
         service_result = await service.apply_modification(agent_result, sample_redis_order)
         
-        print(f"\n[SERVICE OUTPUT]")
-        print(f"  Success: {service_result.success}")
-        print(f"  Message: {service_result.message}")
-        print(f"  Validation Errors: {service_result.validation_errors}")
+        logger.debug("[SERVICE OUTPUT]")
+        logger.debug("  Success: %s", service_result.success)
+        logger.debug("  Message: %s", service_result.message)
+        logger.debug("  Validation Errors: %s", service_result.validation_errors)
         
         # Service should handle partial success (cheese valid, unicorn meat invalid)
         # This might succeed with cheese but fail on unicorn meat, or fail entirely
         # The exact behavior depends on how we implement partial success handling
         assert service_result.success is not None  # Should have a result
 
-        print(f"\n[SUCCESS] Service handled partial success scenario!")
+        logger.debug("[SUCCESS] Service handled partial success scenario!")
 
     @pytest.mark.asyncio
     async def test_context_references(
         self,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
+        agent_result_cache
     ):
         """Test context-based references like 'last item' or 'first item'"""
 
-        # Create a multi-item order
-        multi_item_order = {
-            "id": "order_1234567890",
-            "session_id": "session_123",
-            "restaurant_id": 1,
-            "status": "active",
-            "items": [
-                {
-                    "id": "item_111",
-                    "menu_item_id": 1,
-                    "quantity": 1,
-                    "modifications": {
-                        "size": "regular",
-                        "name": "Burger",
-                        "unit_price": 10.0,
-                        "total_price": 10.0,
-                        "ingredient_modifications": "",
-                        "special_instructions": ""
-                    },
-                    "added_at": "2024-01-01T12:00:00"
-                },
-                {
-                    "id": "item_222",
-                    "menu_item_id": 2,
-                    "quantity": 1,
-                    "modifications": {
-                        "size": "large",
-                        "name": "Fries",
-                        "unit_price": 5.0,
-                        "total_price": 5.0,
-                        "ingredient_modifications": "",
-                        "special_instructions": ""
-                    },
-                    "added_at": "2024-01-01T12:01:00"
-                }
-            ]
-        }
-
         # Test input: Reference last item
         user_input = "Make the last thing I ordered extra cheese"
 
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[MULTI-ITEM ORDER] {len(multi_item_order['items'])} items")
+        logger.debug("[TEST INPUT] '%s'", user_input)
 
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=multi_item_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
 
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Modifications: %s", len(agent_result.modifications))
 
         # Agent should parse the context reference
         assert agent_result.success is True
@@ -1111,91 +680,61 @@ class TestComplexModifyScenario:
         # Should target the last item (Fries, item_222)
         assert agent_result.modifications[0].item_id == "item_222"
 
-        print(f"\n[SUCCESS] Agent correctly resolved context reference!")
+        logger.debug("[SUCCESS] Agent correctly resolved context reference!")
 
     @pytest.mark.asyncio
     async def test_edge_cases(
         self,
         sample_redis_order,
-        sample_conversation_history,
-        sample_menu_item_ingredients,
-        db
+        agent_result_cache
     ):
         """Test edge cases and unusual inputs"""
 
         # Test input: Empty modification
         user_input = "Make the burger with no nothing"
 
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[INITIAL ORDER] {sample_redis_order['items']}")
+        logger.debug("[TEST INPUT] '%s'", user_input)
+        logger.debug("[INITIAL ORDER] %s", sample_redis_order['items'])
 
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=sample_conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
 
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Clarification Needed: {agent_result.clarification_needed}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Clarification Needed: %s", agent_result.clarification_needed)
 
         # Agent should either parse it or ask for clarification
         # This tests how the agent handles ambiguous/empty modifications
         assert agent_result.success is not None
 
-        print(f"\n[SUCCESS] Agent handled edge case appropriately!")
+        logger.debug("[SUCCESS] Agent handled edge case appropriately!")
 
     @pytest.mark.asyncio
     async def test_conversation_context_pronouns(
         self,
         sample_redis_order,
-        sample_menu_item_ingredients,
-        db
+        agent_result_cache
     ):
         """Test pronoun resolution with conversation context"""
 
-        # Create conversation history with recent order
-        conversation_history = ConversationHistory(
-            entries=[
-                ConversationEntry(
-                    role=ConversationRole.USER,
-                    content="I want a burger",
-                    timestamp=datetime.now(),
-                    session_id="test_session"
-                ),
-                ConversationEntry(
-                    role=ConversationRole.ASSISTANT,
-                    content="I've added a burger to your order",
-                    timestamp=datetime.now(),
-                    session_id="test_session"
-                )
-            ],
-            session_id="test_session"
-        )
-
         # Test input: Use pronoun to reference recently mentioned item
         user_input = "Make it extra cheese"
 
-        print(f"\n[TEST INPUT] '{user_input}'")
-        print(f"[CONVERSATION CONTEXT] Recent: 'I want a burger'")
+        logger.debug("[TEST INPUT] '%s'", user_input)
+        logger.debug("[CONVERSATION CONTEXT] Recent: 'I want a burger'")
 
-        # Run real agent
-        agent_result = await modify_item_agent(
-            user_input=user_input,
-            current_order=sample_redis_order["items"],
-            conversation_history=conversation_history
-        )
+        # Real agent result, made up front together with every other test's
+        agent_result = agent_result_cache[user_input].model_copy(deep=True)
 
-        print(f"\n[AGENT OUTPUT]")
-        print(f"  Success: {agent_result.success}")
-        print(f"  Confidence: {agent_result.confidence}")
-        print(f"  Modifications: {len(agent_result.modifications)}")
+        logger.debug("[AGENT OUTPUT]")
+        logger.debug("  Success: %s", agent_result.success)
+        logger.debug("  Confidence: %s", agent_result.confidence)
+        logger.debug("  Modifications: %s", len(agent_result.modifications))
 
         # Agent should resolve "it" to the burger
         assert agent_result.success is True
         assert len(agent_result.modifications) == 1
         assert "cheese" in agent_result.modifications[0].modification.lower()
 
-        print(f"\n[SUCCESS] Agent correctly resolved pronoun with conversation context!")
+        logger.debug("[SUCCESS] Agent correctly resolved pronoun with conversation context!")
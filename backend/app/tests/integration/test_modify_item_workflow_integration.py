@@ -19,14 +19,10 @@ from app.models.menu_item import MenuItem
 from app.models.ingredient import Ingredient
 from app.models.menu_item_ingredient import MenuItemIngredient
 from app.constants.item_sizes import ItemSize
-from app.config.settings import settings
 
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 
 @pytest.fixture
@@ -4,14 +4,10 @@ Integration test for multiple items context resolution
 
 import pytest
 from app.workflow.agents.context_agent import ContextAgent, ContextAgentResult
-from app.config.settings import settings
 
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 
 class TestMultipleItemsContext:
@@ -1,12 +1,8 @@
 import pytest
 from app.workflow.agents.noise_filter_agent import NoiseFilterAgent
-from app.config.settings import settings
 
 # Skip all tests in this file if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 class TestNoiseFilterAgentIntegration:
     """Integration tests for NoiseFilterAgent with real LLM calls"""
@@ -17,15 +17,11 @@ from app.tests.fixtures.database_fixtures import (
     test_menu_items,
     test_services
 )
-from app.config.settings import settings
 from app.dto.conversation_dto import ConversationHistory, ConversationRole
 
 
 # Skip all tests in this file if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 
 class TestQuestionAgentIntegration:
@@ -7,14 +7,10 @@ from unittest.mock import AsyncMock
 from app.workflow.nodes.question_answer_workflow import QuestionAnswerWorkflow
 from app.workflow.response.workflow_result import QuestionAnswerWorkflowResult
 from app.constants.audio_phrases import AudioPhraseType
-from app.config.settings import settings
 
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 
 class TestQuestionAnswerWorkflowIntegration:
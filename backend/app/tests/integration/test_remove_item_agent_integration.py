@@ -8,14 +8,10 @@ import pytest
 from datetime import datetime
 from app.workflow.agents.remove_item_agent import remove_item_agent
 from app.core.session.command_history import CommandHistory, CommandType, CommandStatus
-from app.config.settings import settings
 
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 
 class TestRemoveItemAgentIntegration:
@@ -8,13 +8,9 @@ from app.workflow.nodes.remove_item_workflow import RemoveItemWorkflow
 from app.services.order_session_service import OrderSessionService
 from app.workflow.response.workflow_result import WorkflowResult
 from app.constants.audio_phrases import AudioPhraseType
-from app.config.settings import settings
 
 # Skip all tests if no OpenAI API key
-pytestmark = pytest.mark.skipif(
-    not settings.openai_api_key or settings.openai_api_key == "your-openai-api-key-here",
-    reason="OpenAI API key not configured"
-)
+pytestmark = pytest.mark.requires_openai
 
 
 class TestRemoveItemWorkflowIntegration:
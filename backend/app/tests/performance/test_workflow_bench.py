@@ -0,0 +1,69 @@
+"""
+Benchmarks for the clear/confirm order workflows
+
+Guards ClearOrderWorkflow.execute / ConfirmOrderWorkflow.execute against
+latency regressions. Run in CI with:
+
+    pytest app/tests/performance --benchmark-autosave --benchmark-compare-fail=mean:10%
+"""
+
+import asyncio
+import pytest
+from app.workflow.nodes.clear_order_workflow import ClearOrderWorkflow
+from app.workflow.nodes.confirm_order_workflow import ConfirmOrderWorkflow
+from app.tests.integration._fakes import CANNED_ORDER, FakeOrderSessionService
+
+
+# Enough rounds for stable means on a sub-millisecond workflow
+_ROUNDS = 1000
+
+
+@pytest.fixture(scope="module")
+def bench_loop():
+    """One event loop for every round, so the benchmarks time execute rather than loop setup"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def order_session_service():
+    """Fake OrderSessionService seeded with a canned two-item order"""
+    service = FakeOrderSessionService()
+    service.set_return("get_session_order", CANNED_ORDER)
+    service.set_return("clear_order", True)
+    service.set_return("archive_order_to_postgres", True)
+    service.set_return("finalize_order", True)
+    return service
+
+
+@pytest.fixture
+def clear_order_workflow(order_session_service):
+    """Create ClearOrderWorkflow backed by the fake service"""
+    return ClearOrderWorkflow(order_session_service=order_session_service)
+
+
+@pytest.fixture
+def confirm_order_workflow(order_session_service):
+    """Create ConfirmOrderWorkflow backed by the fake service"""
+    return ConfirmOrderWorkflow(order_session_service=order_session_service)
+
+
+def test_clear_order_bench(benchmark, bench_loop, clear_order_workflow, order_session_service):
+    """Benchmark a successful clear order"""
+    result = benchmark.pedantic(
+        lambda: bench_loop.run_until_complete(clear_order_workflow.execute(session_id="session_123")),
+        setup=order_session_service.calls.clear,
+        rounds=_ROUNDS
+    )
+    assert result.success is True
+
+
+def test_confirm_order_bench(benchmark, bench_loop, confirm_order_workflow, order_session_service):
+    """Benchmark a successful order confirmation"""
+    result = benchmark.pedantic(
+        lambda: bench_loop.run_until_complete(confirm_order_workflow.execute(session_id="session_123")),
+        setup=order_session_service.calls.clear,
+        rounds=_ROUNDS
+    )
+    assert result.success is True
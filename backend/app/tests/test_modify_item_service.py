@@ -169,6 +169,16 @@ class TestModifyItemService:
         assert parsed["quantity_change"] is None
         assert parsed["special_instructions"] == []
 
+    @pytest.mark.asyncio
+    async def test_modification_parsing_lowercases_ingredients(
+        self, modify_item_service
+    ):
+        """Test ingredient modifications are stored lowercase whatever the input case"""
+        
+        parsed = modify_item_service._parse_modification_text("Extra Cheese")
+        
+        assert parsed["ingredient_modifications"] == ["extra cheese"]
+
     @pytest.mark.asyncio
     async def test_modification_parsing_size_change(
         self, modify_item_service
@@ -645,6 +655,48 @@ class TestModifyItemService:
             assert len(result.validation_errors) >= 1  # Should have at least quantity error
             assert "Maximum allowed" in result.message  # Quantity validation should be caught
 
+    @pytest.mark.asyncio
+    async def test_validation_uses_preloaded_caches(self, sample_redis_order):
+        """Test validation reads preloaded menu items and ingredients instead of the database"""
+        
+        menu_item = MagicMock()
+        menu_item.max_quantity = 2
+        service = ModifyItemService(menu_cache={1: menu_item}, ingredient_cache={"cheese": MagicMock()})
+        
+        agent_result = ModifyItemResult(
+            success=True,
+            confidence=0.95,
+            modifications=[
+                ModificationInstruction(
+                    item_id="item_1234567890",
+                    item_name="Cosmic Fish Sandwich",
+                    quantity=3,  # Exceeds max_quantity of the cached menu item
+                    modification="extra cheese",
+                    reasoning="User wants 3 with cheese"
+                ),
+                ModificationInstruction(
+                    item_id="item_1234567890",
+                    item_name="Cosmic Fish Sandwich",
+                    quantity=1,
+                    modification="extra unicorn meat",  # Not in the cached ingredients
+                    reasoning="User wants 1 with unicorn meat"
+                )
+            ],
+            requires_split=False,
+            remaining_unchanged=0
+        )
+        
+        with patch('app.models.menu_item.MenuItem') as mock_menu_item_class, \
+             patch.object(service.ingredient_service, 'search_by_name') as mock_search:
+            result = await service.apply_modification(agent_result, sample_redis_order)
+            
+            mock_menu_item_class.get_or_none.assert_not_called()
+            mock_search.assert_not_called()
+        
+        assert result.success is False
+        assert "Maximum allowed: 2" in result.message
+        assert "'unicorn meat' is not available" in result.message
+
 
 class TestEnhancedModifyItemServiceValidation:
     """Test enhanced validation logic in ModifyItemService"""
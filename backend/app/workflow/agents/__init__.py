@@ -4,18 +4,20 @@ Workflow Agents
 AI agents for processing customer interactions in the drive-thru workflow.
 """
 
-from .item_extraction_agent import item_extraction_agent
+from .item_extraction_agent import item_extraction_agent, item_extraction_agent_batch
 from .remove_item_agent import remove_item_agent
 from .question_agent import question_agent
 from .clarification_agent import clarification_agent, build_clarification_context
-from .intent_classification_agent import intent_classification_agent
+from .intent_classification_agent import intent_classification_agent, intent_classification_agent_batch
 
 __all__ = [
     "item_extraction_agent",
+    "item_extraction_agent_batch",
     "remove_item_agent",
     "question_agent",
     "clarification_agent",
     "build_clarification_context",
     "intent_classification_agent",
+    "intent_classification_agent_batch",
 ]
 
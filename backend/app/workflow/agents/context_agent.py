@@ -5,10 +5,15 @@ This agent transforms ambiguous utterances like "I'll take two" into explicit te
 "I'll take two veggie wraps" using conversation context.
 """
 
+import json
 import logging
+import re
 from typing import List, Dict, Any, Optional, Literal
 from dataclasses import dataclass
-from app.workflow.prompts.context_prompts import get_context_resolution_prompt
+from app.workflow.prompts.context_prompts import (
+    get_context_resolution_prompt,
+    get_batch_context_resolution_prompt
+)
 from app.config.settings import settings
 from app.dto.conversation_dto import ConversationHistory
 
@@ -38,6 +43,18 @@ class ContextAgent:
     def __init__(self):
         """Initialize the context agent"""
         self.logger = logger
+        self._llm = None
+    
+    def _get_llm(self):
+        """Create the LLM client on first use and reuse it (and its connection pool) afterwards"""
+        if self._llm is None:
+            from langchain_openai import ChatOpenAI
+            self._llm = ChatOpenAI(
+                model="gpt-4o",
+                api_key=settings.openai_api_key,
+                temperature=0.1
+            )
+        return self._llm
     
     async def resolve_context(
         self,
@@ -84,11 +101,6 @@ class ContextAgent:
             else:
                 self.logger.info(f"  Command history: EMPTY")
             
-            # Build context for LLM
-            context_data = self._build_context_data(
-                conversation_history, command_history, current_order
-            )
-            
             # Get prompt for LLM
             prompt = get_context_resolution_prompt(
                 user_input=user_input,
@@ -98,7 +110,7 @@ class ContextAgent:
             )
             
             # Use LLM to resolve context
-            result = await self._llm_resolve_context(prompt, context_data, user_input)
+            result = await self._llm_resolve_context(prompt, user_input)
             
             self.logger.info(f"Context resolution result: status={result.status}, "
                            f"confidence={result.confidence:.2f}")
@@ -112,64 +124,57 @@ class ContextAgent:
                 rationale=f"Agent failed: {str(e)}"
             )
     
-    def _build_context_data(
+    async def resolve_context_batch(
         self,
-        conversation_history: ConversationHistory,
-        command_history: ConversationHistory,
-        current_order: Optional[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Build context data for LLM"""
-        return {
-            "conversation_history": conversation_history.get_recent_entries(5),
-            "command_history": command_history.get_recent_entries(5),
-            "current_order": current_order or {},
-            "context_summary": self._build_context_summary(
-                conversation_history, command_history, current_order
-            )
-        }
-    
-    def _build_context_summary(
-        self,
-        conversation_history: ConversationHistory,
-        command_history: ConversationHistory,
-        current_order: Optional[Dict[str, Any]]
-    ) -> str:
-        """Build a summary of context for the LLM"""
-        summary_parts = []
+        inputs: List[Dict[str, Any]]
+    ) -> List[ContextAgentResult]:
+        """
+        Resolve several independent inputs with a single LLM call.
         
-        # Recent conversation (last 3 turns)
-        if not conversation_history.is_empty():
-            recent_conv = conversation_history.get_recent_entries(3)
-            conv_text = "\n".join([
-                f"{entry.role.value}: {entry.content}" 
-                for entry in recent_conv
-            ])
-            summary_parts.append(f"Recent conversation:\n{conv_text}")
+        The shared instructions are sent once, followed by one scenario block per
+        input. If the batched response can't be matched up with the inputs, every
+        input is resolved separately through the client's abatch instead.
         
-        # Current order summary
-        if current_order and current_order.get('items'):
-            order_items = current_order['items']
-            order_text = ", ".join([
-                f"{item.get('quantity', 1)}x {item.get('name', 'Unknown')}" 
-                for item in order_items
-            ])
-            summary_parts.append(f"Current order: {order_text}")
+        Args:
+            inputs: resolve_context keyword-argument dicts
+            
+        Returns:
+            List[ContextAgentResult]: One result per input, in input order
+        """
+        if not inputs:
+            return []
         
-        # Recent commands (last 3 commands)
-        if not command_history.is_empty():
-            recent_commands = command_history.get_recent_entries(3)
-            cmd_text = "\n".join([
-                f"Command: {entry.role.value} - {entry.content}" 
-                for entry in recent_commands
+        try:
+            from langchain_core.messages import HumanMessage
+            
+            llm = self._get_llm()
+            
+            prompt = get_batch_context_resolution_prompt(inputs)
+            response = await llm.ainvoke([HumanMessage(content=prompt)])
+            results = self._parse_batch_response(response.content.strip(), len(inputs))
+            if results is not None:
+                return results
+            
+            self.logger.warning("Batched context response did not match the inputs, resolving each input separately")
+            responses = await llm.abatch([
+                [HumanMessage(content=get_context_resolution_prompt(**kwargs))]
+                for kwargs in inputs
             ])
-            summary_parts.append(f"Recent commands:\n{cmd_text}")
-        
-        return "\n\n".join(summary_parts)
+            return [self._parse_response(response.content.strip()) for response in responses]
+            
+        except Exception as e:
+            self.logger.error(f"Batched context resolution failed: {e}")
+            return [
+                ContextAgentResult(
+                    status="SYSTEM_ERROR",
+                    rationale=f"Batch resolution failed: {str(e)}"
+                )
+                for _ in inputs
+            ]
     
     async def _llm_resolve_context(
         self, 
         prompt: str, 
-        context_data: Dict[str, Any],
         user_input: str
     ) -> ContextAgentResult:
         """
@@ -177,58 +182,23 @@ class ContextAgent:
         
         Args:
             prompt: The formatted prompt for the LLM
-            context_data: Context data for the LLM
+            user_input: The ambiguous user input
             
         Returns:
             ContextAgentResult: Resolution result
         """
         # Use real LLM for context resolution
         try:
-            from langchain_openai import ChatOpenAI
             from langchain_core.messages import HumanMessage
             
-            # Create LLM instance
-            llm = ChatOpenAI(
-                model="gpt-4o",
-                api_key=settings.openai_api_key,
-                temperature=0.1
-            )
+            llm = self._get_llm()
             
             # Create message with the prompt
             message = HumanMessage(content=prompt)
             
             # Get LLM response
             response = await llm.ainvoke([message])
-            response_text = response.content.strip()
-            
-            # Parse the JSON response (handle markdown code blocks)
-            import json
-            import re
-            
-            # Extract JSON from markdown code blocks if present
-            json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(1)
-            else:
-                json_text = response_text
-            
-            try:
-                result_data = json.loads(json_text)
-                
-                return ContextAgentResult(
-                    status=result_data.get("status", "CLARIFICATION_NEEDED"),
-                    resolved_text=result_data.get("resolved_text"),
-                    clarification_message=result_data.get("clarification_message"),
-                    confidence=result_data.get("confidence", 0.5),
-                    rationale=result_data.get("rationale", "LLM-based resolution")
-                )
-                
-            except json.JSONDecodeError:
-                self.logger.error(f"Failed to parse LLM response as JSON: {response_text}")
-                return ContextAgentResult(
-                    status="SYSTEM_ERROR",
-                    rationale=f"Failed to parse LLM response: {response_text}"
-                )
+            return self._parse_response(response.content.strip())
                 
         except Exception as e:
             self.logger.error(f"LLM context resolution failed: {e}")
@@ -236,3 +206,56 @@ class ContextAgent:
                 status="SYSTEM_ERROR",
                 rationale=f"LLM resolution failed: {str(e)}"
             )
+    
+    def _parse_response(self, response_text: str) -> ContextAgentResult:
+        """Parse a single JSON resolution (optionally in a markdown code block)"""
+        # Extract JSON from markdown code blocks if present
+        json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+        if json_match:
+            json_text = json_match.group(1)
+        else:
+            json_text = response_text
+        
+        try:
+            return self._result_from_data(json.loads(json_text))
+            
+        except json.JSONDecodeError:
+            self.logger.error(f"Failed to parse LLM response as JSON: {response_text}")
+            return ContextAgentResult(
+                status="SYSTEM_ERROR",
+                rationale=f"Failed to parse LLM response: {response_text}"
+            )
+    
+    def _parse_batch_response(
+        self,
+        response_text: str,
+        expected_count: int
+    ) -> Optional[List[ContextAgentResult]]:
+        """Parse a JSON array of resolutions, or return None if it doesn't cover every scenario"""
+        json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+        if not json_match:
+            return None
+        
+        try:
+            items = json.loads(json_match.group(0))
+        except json.JSONDecodeError:
+            return None
+        
+        if len(items) != expected_count or not all(isinstance(item, dict) for item in items):
+            return None
+        
+        # Order by scenario id when the model echoed them back
+        if all(isinstance(item.get("id"), int) for item in items):
+            items = sorted(items, key=lambda item: item["id"])
+        
+        return [self._result_from_data(item) for item in items]
+    
+    def _result_from_data(self, result_data: Dict[str, Any]) -> ContextAgentResult:
+        """Build a ContextAgentResult from a parsed JSON object"""
+        return ContextAgentResult(
+            status=result_data.get("status", "CLARIFICATION_NEEDED"),
+            resolved_text=result_data.get("resolved_text"),
+            clarification_message=result_data.get("clarification_message"),
+            confidence=result_data.get("confidence", 0.5),
+            rationale=result_data.get("rationale", "LLM-based resolution")
+        )
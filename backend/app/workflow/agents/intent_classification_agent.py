@@ -7,22 +7,95 @@ Does NOT validate against menu or state - just classifies intent.
 Stateless agent that takes user input and conversation history only.
 """
 
+import asyncio
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from langchain_openai import ChatOpenAI
 from app.constants.intent_types import IntentType
-from app.workflow.response.intent_classification_response import IntentClassificationResult
-from app.workflow.prompts.intent_classification_prompts import get_intent_classification_prompt
+from app.workflow.response.intent_classification_response import (
+    IntentClassificationResult,
+    IntentClassificationBatchResult
+)
+from app.workflow.prompts.intent_classification_prompts import (
+    get_intent_classification_prompt,
+    get_intent_classification_batch_prompt
+)
 from app.config.settings import settings
 from app.dto.conversation_dto import ConversationHistory
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_MODEL = "gpt-4o"
+_DEFAULT_TEMPERATURE = 0.1
+
+
+@lru_cache(maxsize=None)
+def _get_chat_model(model: str, temperature: float, max_tokens: Optional[int]) -> ChatOpenAI:
+    """Create one chat model per configuration and reuse it (and its connection pool) afterwards"""
+    return ChatOpenAI(
+        model=model,
+        api_key=settings.openai_api_key,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_llm(model: str, temperature: float, max_tokens: Optional[int]):
+    """Structured-output runnable for a single classification"""
+    # Function calling gives reliable structured output
+    return _get_chat_model(model, temperature, max_tokens).with_structured_output(
+        IntentClassificationResult, method="function_calling"
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_batch_llm(model: str, temperature: float, max_tokens: Optional[int]):
+    """Structured-output runnable for a batch of classifications"""
+    return _get_chat_model(model, temperature, max_tokens).with_structured_output(
+        IntentClassificationBatchResult, method="function_calling"
+    )
+
+
+def _llm_config(
+    model: Optional[str],
+    temperature: Optional[float],
+    max_tokens: Optional[int]
+) -> tuple:
+    """Fill in production defaults for any LLM setting not overridden"""
+    return (
+        model or _DEFAULT_MODEL,
+        _DEFAULT_TEMPERATURE if temperature is None else temperature,
+        max_tokens
+    )
+
+
+def _build_context(
+    user_input: str,
+    conversation_history: ConversationHistory,
+    order_items: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build minimal context for the LLM"""
+    return {
+        "user_input": user_input,
+        # Last 5 turns max, without timestamps so identical histories render identical prompts
+        "conversation_history": [
+            f"{entry.role.value}: {entry.content}"
+            for entry in conversation_history.get_recent_entries(5)
+        ],
+        "order_items": order_items,
+        "conversation_state": "Ordering"  # Simplified - could be made dynamic if needed
+    }
+
 
 async def intent_classification_agent(
     user_input: str,
     conversation_history: Optional[ConversationHistory] = None,
-    order_items: Optional[List[Dict[str, Any]]] = None
+    order_items: Optional[List[Dict[str, Any]]] = None,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None
 ) -> IntentClassificationResult:
     """
     Classify user intent using LLM with structured JSON output.
@@ -36,6 +109,9 @@ async def intent_classification_agent(
         user_input: Raw user input text
         conversation_history: Optional previous conversation turns (defaults to empty list)
         order_items: Optional current order items for context (defaults to empty list)
+        model: Optional model override (defaults to gpt-4o)
+        temperature: Optional temperature override (defaults to 0.1)
+        max_tokens: Optional cap on output tokens
         
     Returns:
         IntentClassificationResult with intent, confidence, and cleansed input
@@ -69,25 +145,13 @@ async def intent_classification_agent(
             logger.info(f"  Order items: EMPTY")
         
         # Build minimal context for the LLM
-        context = {
-            "user_input": user_input,
-            "conversation_history": conversation_history.get_recent_entries(5),  # Last 5 turns max
-            "order_items": order_items,
-            "conversation_state": "Ordering"  # Simplified - could be made dynamic if needed
-        }
+        context = _build_context(user_input, conversation_history, order_items)
         
         # Get formatted prompt
         prompt = get_intent_classification_prompt(user_input, context)
         
-        # Set up LangChain with function calling for reliable structured output
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.openai_api_key,
-            temperature=0.1
-        ).with_structured_output(IntentClassificationResult, method="function_calling")
-        
         # Execute LLM call
-        result = await llm.ainvoke(prompt)
+        result = await _get_llm(*_llm_config(model, temperature, max_tokens)).ainvoke(prompt)
         
         logger.info(f"Intent classified: {result.intent} (confidence: {result.confidence})")
         
@@ -101,3 +165,68 @@ async def intent_classification_agent(
             confidence=0.1,
             reasoning=f"Classification failed: {str(e)}"
         )
+
+
+async def intent_classification_agent_batch(
+    user_inputs: List[str],
+    conversation_history: Optional[ConversationHistory] = None,
+    order_items: Optional[List[Dict[str, Any]]] = None,
+    model: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None
+) -> List[IntentClassificationResult]:
+    """
+    Classify several user inputs that share the same context with one LLM call.
+    
+    The shared instructions and context are sent once, followed by the numbered
+    inputs. If the LLM returns the wrong number of results, each input is
+    classified separately instead.
+    
+    Args:
+        user_inputs: Raw user input texts
+        conversation_history: Optional previous conversation turns shared by every input
+        order_items: Optional current order items shared by every input
+        model: Optional model override (defaults to gpt-4o)
+        temperature: Optional temperature override (defaults to 0.1)
+        max_tokens: Optional cap on output tokens per input
+        
+    Returns:
+        One IntentClassificationResult per input, in input order
+    """
+    if not user_inputs:
+        return []
+    
+    try:
+        if conversation_history is None:
+            conversation_history = ConversationHistory(session_id="")
+        order_items = order_items or []
+        
+        context = _build_context("", conversation_history, order_items)
+        prompt = get_intent_classification_batch_prompt(user_inputs, context)
+        
+        batch_max_tokens = max_tokens * len(user_inputs) if max_tokens else None
+        batch = await _get_batch_llm(*_llm_config(model, temperature, batch_max_tokens)).ainvoke(prompt)
+        if len(batch.results) == len(user_inputs):
+            return batch.results
+        
+        logger.warning(
+            f"Batch classification returned {len(batch.results)} results for {len(user_inputs)} inputs, "
+            f"classifying each input separately"
+        )
+        return list(await asyncio.gather(*[
+            intent_classification_agent(
+                user_input, conversation_history, order_items, model, temperature, max_tokens
+            )
+            for user_input in user_inputs
+        ]))
+        
+    except Exception as e:
+        logger.error(f"Batch intent classification failed: {e}", exc_info=True)
+        return [
+            IntentClassificationResult(
+                intent=IntentType.UNKNOWN,
+                confidence=0.1,
+                reasoning=f"Classification failed: {str(e)}"
+            )
+            for _ in user_inputs
+        ]
@@ -5,16 +5,49 @@ First agent in the pipeline that extracts items, quantities, modifiers, and spec
 from user input without doing any menu resolution. Pure LLM processing with structured output.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from app.config.settings import settings
-from app.workflow.response.item_extraction_response import ItemExtractionResponse, ExtractedItem
-from app.workflow.prompts.item_extraction_prompts import build_item_extraction_prompt
+from app.workflow.response.item_extraction_response import (
+    ItemExtractionResponse,
+    ItemExtractionBatchResponse,
+    ExtractedItem
+)
+from app.workflow.prompts.item_extraction_prompts import (
+    build_item_extraction_prompt,
+    build_item_extraction_batch_prompt
+)
 
 logger = logging.getLogger(__name__)
 
+_MODEL = "gpt-4o"
+
+
+@lru_cache(maxsize=None)
+def _get_chat_model() -> ChatOpenAI:
+    """Create the chat model once and reuse it (and its connection pool) afterwards"""
+    return ChatOpenAI(
+        model=_MODEL,
+        api_key=settings.openai_api_key,
+        temperature=0.1
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_llm():
+    """Structured-output runnable for a single extraction"""
+    return _get_chat_model().with_structured_output(ItemExtractionResponse, method="function_calling")
+
+
+@lru_cache(maxsize=None)
+def _get_batch_llm():
+    """Structured-output runnable for a batch of extractions"""
+    return _get_chat_model().with_structured_output(ItemExtractionBatchResponse, method="function_calling")
+
 
 async def item_extraction_agent(user_input: str, context: Dict[str, Any]) -> ItemExtractionResponse:
     """
@@ -31,13 +64,6 @@ async def item_extraction_agent(user_input: str, context: Dict[str, Any]) -> Ite
         ItemExtractionResponse with extracted items and metadata
     """
     try:
-        # Set up LLM with structured output
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.openai_api_key,
-            temperature=0.1
-        ).with_structured_output(ItemExtractionResponse, method="function_calling")
-        
         # Get context data
         conversation_history = context.get("conversation_history", [])
         order_state = context.get("order_state", {})
@@ -47,35 +73,82 @@ async def item_extraction_agent(user_input: str, context: Dict[str, Any]) -> Ite
         prompt = build_item_extraction_prompt(user_input, conversation_history, order_state, restaurant_id)
         
         # Execute the extraction
-        result = await llm.ainvoke(prompt)
+        result = await _get_llm().ainvoke(prompt)
         
         # DEBUG: Log the result
-        print(f"\n[DEBUG] ITEM EXTRACTION AGENT:")
-        print(f"   Success: {result.success}")
-        print(f"   Confidence: {result.confidence}")
-        print(f"   Items extracted: {len(result.extracted_items)}")
+        logger.debug("Item extraction agent:")
+        logger.debug("   Success: %s", result.success)
+        logger.debug("   Confidence: %s", result.confidence)
+        logger.debug("   Items extracted: %s", len(result.extracted_items))
         for i, item in enumerate(result.extracted_items):
-            print(f"     Item {i+1}: '{item.item_name}' (qty: {item.quantity}, confidence: {item.confidence})")
+            logger.debug("     Item %s: '%s' (qty: %s, confidence: %s)", i+1, item.item_name, item.quantity, item.confidence)
         
         return result
         
     except Exception as e:
         logger.error(f"Item extraction agent failed: {e}")
-        print(f"[DEBUG] Extraction agent exception: {e}")
         
         # Return error response
-        return ItemExtractionResponse(
-            success=False,
-            confidence=0.0,
-            extracted_items=[
-                ExtractedItem(
-                    item_name="unknown",
-                    quantity=1,
-                    confidence=0.0,
-                    context_notes=f"Extraction failed: {str(e)}"
-                )
-            ],
-            needs_clarification=True,
-            clarification_questions=["I'm sorry, I had trouble understanding your request. Could you please try again?"]
+        return _error_response(e)
+
+
+async def item_extraction_agent_batch(user_inputs: List[str], context: Dict[str, Any]) -> List[ItemExtractionResponse]:
+    """
+    Extract items from several user inputs that share the same context with one LLM call.
+    
+    The shared instructions and context are sent once, followed by the inputs as
+    a JSON array. If the LLM returns the wrong number of results, each input is
+    extracted separately instead.
+    
+    Args:
+        user_inputs: The cleaned user input texts
+        context: Context containing conversation history, order state, etc.
+        
+    Returns:
+        One ItemExtractionResponse per input, in input order
+    """
+    if not user_inputs:
+        return []
+    
+    try:
+        prompt = build_item_extraction_batch_prompt(
+            user_inputs,
+            context.get("conversation_history", []),
+            context.get("order_state", {}),
+            context.get("restaurant_id", "1")
         )
+        
+        batch = await _get_batch_llm().ainvoke(prompt)
+        if len(batch.results) == len(user_inputs):
+            return batch.results
+        
+        logger.warning(
+            f"Batch extraction returned {len(batch.results)} results for {len(user_inputs)} inputs, "
+            f"extracting each input separately"
+        )
+        return list(await asyncio.gather(*[
+            item_extraction_agent(user_input, context) for user_input in user_inputs
+        ]))
+        
+    except Exception as e:
+        logger.error(f"Batch item extraction failed: {e}")
+        return [_error_response(e) for _ in user_inputs]
+
+
+def _error_response(error: Exception) -> ItemExtractionResponse:
+    """Build the response returned when extraction fails"""
+    return ItemExtractionResponse(
+        success=False,
+        confidence=0.0,
+        extracted_items=[
+            ExtractedItem(
+                item_name="unknown",
+                quantity=1,
+                confidence=0.0,
+                context_notes=f"Extraction failed: {str(error)}"
+            )
+        ],
+        needs_clarification=True,
+        clarification_questions=["I'm sorry, I had trouble understanding your request. Could you please try again?"]
+    )
 
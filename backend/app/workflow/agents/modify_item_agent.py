@@ -8,15 +8,29 @@ This agent does NOT modify the database - it only parses and identifies.
 """
 
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from langchain_openai import ChatOpenAI
 from app.workflow.response.modify_item_response import ModifyItemResult
-from app.workflow.prompts.modify_item_prompts import get_modify_item_prompt
+from app.workflow.prompts.modify_item_prompts import get_modify_item_messages
 from app.config.settings import settings
 from app.dto.conversation_dto import ConversationHistory
 
 logger = logging.getLogger(__name__)
 
+_MODEL = "gpt-4o"
+
+
+@lru_cache(maxsize=None)
+def _get_llm():
+    """Create the structured-output LLM once and reuse it (and its connection pool) afterwards"""
+    # Function calling gives reliable structured output
+    return ChatOpenAI(
+        model=_MODEL,
+        api_key=settings.openai_api_key,
+        temperature=0.1
+    ).with_structured_output(ModifyItemResult, method="function_calling")
+
 
 async def modify_item_agent(
     user_input: str,
@@ -54,23 +68,16 @@ async def modify_item_agent(
         if command_history is None:
             command_history = ConversationHistory(session_id="")
         
-        # Get formatted prompt
-        prompt = get_modify_item_prompt(
+        # Get formatted prompt (static system message + per-request context)
+        messages = get_modify_item_messages(
             user_input=user_input,
             current_order=current_order,
             conversation_history=conversation_history,
             command_history=command_history
         )
         
-        # Set up LangChain with function calling for reliable structured output
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=settings.openai_api_key,
-            temperature=0.1
-        ).with_structured_output(ModifyItemResult, method="function_calling")
-        
         # Execute LLM call
-        result = await llm.ainvoke(prompt)
+        result = await _get_llm().ainvoke(messages)
         
         logger.info(f"Modify item parsed: {len(result.modifications)} modifications (confidence: {result.confidence})")
         if result.requires_split:
@@ -6,39 +6,14 @@ from typing import List, Dict, Any, Optional
 from app.dto.conversation_dto import ConversationHistory
 
 
-def get_context_resolution_prompt(
-    user_input: str,
-    conversation_history: ConversationHistory,
-    command_history: ConversationHistory,
-    current_order: Optional[Dict[str, Any]] = None
-) -> str:
-    """
-    Generate the prompt for context resolution.
-    
-    Args:
-        user_input: The ambiguous user input
-        conversation_history: Recent conversation turns
-        command_history: Recent command history
-        current_order: Current order state (optional)
-        
-    Returns:
-        Formatted prompt string
-    """
-    
-    # Build context summary
-    context_summary = _build_context_summary(
-        conversation_history, command_history, current_order
-    )
-    
-    prompt = f"""You are a context resolution agent for a drive-thru restaurant AI system.
+# Invariant instructions, kept ahead of the per-request context so the static
+# rules and examples read as one block. At roughly 650 tokens they are below the
+# 1024-token minimum for OpenAI's automatic prompt caching, so this ordering
+# does not make the prefix cacheable on its own.
+_CONTEXT_RESOLUTION_INSTRUCTIONS = """You are a context resolution agent for a drive-thru restaurant AI system.
 
 Your job is to transform ambiguous user input into explicit, actionable text by using conversation and command history.
 
-CONTEXT:
-{context_summary}
-
-USER INPUT: "{user_input}"
-
 PURPOSE:
 You are ONLY called when the user’s message *might* contain deixis (it/that/these), ellipsis (“one more,” “same again”), or repair markers (“actually,” “scratch that”).  
 If the input is already explicit (names an item/category and optionally a quantity, with no pronouns/demonstratives), you MUST return it unchanged.
@@ -68,13 +43,13 @@ RULES:
 5. If input is too vague (<0.3 confidence) → UNRESOLVABLE, ask user to restate.
 
 OUTPUT FORMAT:
-{{
+{
   "status": "SUCCESS" | "CLARIFICATION_NEEDED" | "UNRESOLVABLE",
   "resolved_text": "Explicit text if SUCCESS, null otherwise",
   "clarification_message": "Clarification request if needed, null if SUCCESS",
   "confidence": 0.95,
   "rationale": "Brief explanation of decision"
-}}
+}
 
 EXAMPLES:
 - User: "Give me 3 wraps."
@@ -88,11 +63,84 @@ EXAMPLES:
 - Context: Last assistant added “2 Cookies” and “2 Tacos.”
   User: "Take those off."
   → CLARIFICATION_NEEDED; clarification_message: "Remove the 2 Cookies or the 2 Tacos?
-  """
+"""
+
+
+# Appended after the shared instructions when several independent inputs are
+# resolved in one call, so the instructions are only sent once per batch
+_BATCH_RESOLUTION_INSTRUCTIONS = """BATCH MODE:
+The requests below are independent. Each one is wrapped in a <scenario id="N"> block with its own CONTEXT and USER INPUT.
+Resolve every scenario on its own, using only the context inside its block.
+Return ONLY a JSON array containing one OUTPUT FORMAT object per scenario, in scenario order, each with an added "id" field holding its scenario id.
+"""
+
+
+def get_context_resolution_prompt(
+    user_input: str,
+    conversation_history: ConversationHistory,
+    command_history: ConversationHistory,
+    current_order: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Generate the prompt for context resolution.
+    
+    Args:
+        user_input: The ambiguous user input
+        conversation_history: Recent conversation turns
+        command_history: Recent command history
+        current_order: Current order state (optional)
+        
+    Returns:
+        Formatted prompt string
+    """
+    
+    # Build context summary
+    context_summary = _build_context_summary(
+        conversation_history, command_history, current_order
+    )
+    
+    prompt = f"""{_CONTEXT_RESOLUTION_INSTRUCTIONS}
+CONTEXT:
+{context_summary}
+
+USER INPUT: "{user_input}"
+"""
 
     return prompt
 
 
+def get_batch_context_resolution_prompt(inputs: List[Dict[str, Any]]) -> str:
+    """
+    Generate one prompt that resolves several inputs at once.
+    
+    Args:
+        inputs: get_context_resolution_prompt keyword-argument dicts
+        
+    Returns:
+        Formatted prompt string with one <scenario> block per input
+    """
+    
+    scenario_blocks = []
+    for scenario_id, kwargs in enumerate(inputs, start=1):
+        context_summary = _build_context_summary(
+            kwargs["conversation_history"],
+            kwargs["command_history"],
+            kwargs.get("current_order")
+        )
+        scenario_blocks.append(f"""<scenario id="{scenario_id}">
+CONTEXT:
+{context_summary}
+
+USER INPUT: "{kwargs['user_input']}"
+</scenario>""")
+    
+    scenarios = "\n\n".join(scenario_blocks)
+    return f"""{_CONTEXT_RESOLUTION_INSTRUCTIONS}
+{_BATCH_RESOLUTION_INSTRUCTIONS}
+{scenarios}
+"""
+
+
 def _build_context_summary(
     conversation_history: ConversationHistory,
     command_history: ConversationHistory,
@@ -2,7 +2,7 @@
 Simple intent classification prompts
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 from langchain_core.prompts import PromptTemplate
 
 
@@ -137,3 +137,29 @@ Return ONLY the JSON response.
         conversation_state=context.get("conversation_state", "Ordering"),
         conversation_history=context.get("conversation_history", [])
     )
+
+
+def get_intent_classification_batch_prompt(user_inputs: List[str], context: Dict[str, Any]) -> str:
+    """
+    Build one prompt that classifies several inputs sharing the same context
+
+    Args:
+        user_inputs: User input texts to classify independently
+        context: Conversation context shared by every input
+
+    Returns:
+        Formatted prompt string ready for LangChain
+    """
+    prompt = get_intent_classification_prompt("(see USER INPUTS below)", context)
+    numbered_inputs = "\n".join(
+        f'{i}. "{user_input}"' for i, user_input in enumerate(user_inputs, start=1)
+    )
+
+    return f"""{prompt}
+BATCH MODE:
+Classify each of the {len(user_inputs)} USER INPUTS below on its own, as if it were the only USER INPUT, using the same CONTEXT.
+Return one result per input, in the same order.
+
+USER INPUTS:
+{numbered_inputs}
+"""
@@ -2,6 +2,9 @@
 Prompts for Item Extraction Agent
 """
 
+import json
+
+
 def build_item_extraction_prompt(user_input: str, conversation_history: list, order_state: dict, restaurant_id: str) -> str:
     """
     Build the prompt for item extraction.
@@ -101,3 +104,27 @@ Return structured data with all extracted items.
     
     return prompt
 
+
+def build_item_extraction_batch_prompt(user_inputs: list, conversation_history: list, order_state: dict, restaurant_id: str) -> str:
+    """
+    Build one prompt that extracts items from several inputs sharing the same context.
+    
+    Args:
+        user_inputs: The user input texts, each extracted independently
+        conversation_history: Recent conversation history
+        order_state: Current order state
+        restaurant_id: Restaurant ID for context
+        
+    Returns:
+        Formatted prompt string
+    """
+    prompt = build_item_extraction_prompt("(see CUSTOMER INPUTS below)", conversation_history, order_state, restaurant_id)
+    
+    return f"""{prompt}
+BATCH MODE:
+Extract items from each of the {len(user_inputs)} CUSTOMER INPUTS below on its own, as if it were the only thing the customer said.
+Return {{"results": [...]}} with one extraction per input, in the same order.
+
+CUSTOMER INPUTS:
+{json.dumps(user_inputs)}
+"""
@@ -4,41 +4,16 @@ Prompts for Modify Item Agent
 Handles parsing user modification requests and identifying target items.
 """
 
-from typing import Dict, Any, List
-from langchain_core.prompts import PromptTemplate
+import re
+from typing import Dict, Any, List, Literal
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from app.dto.conversation_dto import ConversationHistory
 
 
-def get_modify_item_prompt(
-    user_input: str,
-    current_order: List[Dict[str, Any]],
-    conversation_history: ConversationHistory,
-    command_history: ConversationHistory
-) -> str:
-    """
-    Build the prompt for LLM item modification parsing
-    
-    Args:
-        user_input: User's modification request
-        current_order: Current order items with details
-        conversation_history: Recent conversation turns
-        command_history: Recent commands executed
-        
-    Returns:
-        Formatted prompt string ready for LangChain
-    """
-    
-    # Format order items for context
-    order_context = _format_order_context(current_order)
-    
-    # Format conversation history
-    conversation_context = _format_conversation_context(conversation_history)
-    
-    # Format command history
-    command_context = _format_command_context(command_history)
-    
-    template = """
-You are an order modification parser for a drive-thru restaurant. Parse the user's modification request and identify one or more target items, including subsets of a quantity, with the modifications to apply.
+# Static instructions sent as the system message. They contain no per-request
+# data, so every call shares a byte-identical prefix that OpenAI's automatic
+# prompt caching can reuse.
+_MODIFY_ITEM_INSTRUCTIONS = """You are an order modification parser for a drive-thru restaurant. Parse the user's modification request and identify one or more target items, including subsets of a quantity, with the modifications to apply.
 
 MODIFIER NORMALIZATION:
 You MUST normalize modifier actions to these canonical forms:
@@ -69,18 +44,6 @@ Examples:
 - User says: "Make the burger with unicorn meat" → OK, target the burger (let service validate "unicorn meat")
 - User says: "Change the burger quantity to 100" → OK, target the burger (let service validate quantity limits)
 
-CONTEXT:
-Current Order:
-{order_context}
-
-Conversation History:
-{conversation_context}
-
-Command History:
-{command_context}
-
-USER INPUT: "{user_input}"
-
 TASK
 Return a structured JSON object that:
 1) Selects one or more target items or item groups.
@@ -121,31 +84,31 @@ E. Clarification trigger
 REQUIRED JSON FORMAT
 Return ONLY this JSON object:
 
-{{
+{
   "success": true,
   "confidence": 0.92,
   "modifications": [
-    {{
+    {
       "item_id": "item_123",
       "item_name": "Cosmic Fish Sandwich",
       "quantity": 2,
       "modification": "extra cheese",
       "reasoning": "User said '2 of those fish sandwiches' with extra cheese"
-    }},
-    {{
+    },
+    {
       "item_id": "item_123", 
       "item_name": "Cosmic Fish Sandwich",
       "quantity": 1,
       "modification": "no lettuce",
       "reasoning": "User said 'one with no lettuce'"
-    }}
+    }
   ],
   "requires_split": true,
   "remaining_unchanged": 1,
   "clarification_needed": false,
   "clarification_message": null,
   "reasoning": "User wants to modify 3 out of 4 fish sandwiches with different modifications"
-}}
+}
 
 CONFIDENCE GUIDELINES
 - 0.9-1.0 very clear. 0.7-0.8 clear with minor ambiguity. 0.5-0.6 unclear. 0.0-0.4 request clarification.
@@ -156,14 +119,14 @@ EXAMPLES
 Order: one line item ID 45, "Fish Sandwich", quantity 4.
 Input: "Those 4 fish sandwiches, make 2 of them extra cheese and 1 of them no lettuce."
 → success true
-→ modifications: [{{"item_id": "item_45", "quantity": 2, "modification": "extra cheese"}}, {{"item_id": "item_45", "quantity": 1, "modification": "no lettuce"}}]
+→ modifications: [{"item_id": "item_45", "quantity": 2, "modification": "extra cheese"}, {"item_id": "item_45", "quantity": 1, "modification": "no lettuce"}]
 → requires_split true, remaining_unchanged: 1
 
 2) Simple modification
 Order: line item ID item_77, "Taco", quantity 1.
 Input: "Make the taco extra cheese"
 → success true
-→ modifications: [{{"item_id": "item_77", "quantity": 1, "modification": "extra cheese"}}]
+→ modifications: [{"item_id": "item_77", "quantity": 1, "modification": "extra cheese"}]
 → requires_split false
 
 3) Item not in order - MUST ask for clarification
@@ -177,7 +140,7 @@ Input: "Make the fries extra cheese"
 Order: line item ID item_45, "Burger", quantity 1.
 Input: "Make the burger with unicorn meat"
 → success true
-→ modifications: [{{"item_id": "item_45", "quantity": 1, "modification": "add unicorn meat"}}]
+→ modifications: [{"item_id": "item_45", "quantity": 1, "modification": "add unicorn meat"}]
 → requires_split false
 → (Service will validate "unicorn meat" and reject if invalid)
 
@@ -185,7 +148,7 @@ Input: "Make the burger with unicorn meat"
 Order: line item ID item_45, "Burger", quantity 1.
 Input: "Change the burger quantity to 100"
 → success true
-→ modifications: [{{"item_id": "item_45", "quantity": 100, "modification": "change quantity to 100"}}]
+→ modifications: [{"item_id": "item_45", "quantity": 100, "modification": "change quantity to 100"}]
 → requires_split false
 → (Service will validate quantity limits and reject if excessive)
 
@@ -193,7 +156,7 @@ Input: "Change the burger quantity to 100"
 Order: line item ID item_45, "Burger", quantity 4.
 Input: "Actually make it just two."
 → success true
-→ modifications: [{{"item_id": "item_45", "quantity": 2, "modification": "change quantity to 2"}}]
+→ modifications: [{"item_id": "item_45", "quantity": 2, "modification": "change quantity to 2"}]
 → requires_split false
 
 4) Clarification needed
@@ -204,20 +167,114 @@ Input: "Make one of those no lettuce."
 
 Return ONLY the JSON response. Do not include any other text.
 """
+
+# Worked examples kept by the compact variant: the split example and both
+# clarification cases, so compact mode still asks when an item is missing or ambiguous
+_COMPACT_EXAMPLES = (
+    "1) Distribution over one group",
+    "3) Item not in order - MUST ask for clarification",
+    "4) Clarification needed",
+)
+
+
+def _compact_instructions(instructions: str) -> str:
+    """Keep only the _COMPACT_EXAMPLES worked examples and collapse blank lines"""
+    preamble, heading, rest = instructions.partition("\nEXAMPLES\n")
+    examples, closing, tail = rest.partition("\nReturn ONLY")
+    kept = [
+        example for example in re.split(r"\n(?=\d\) )", examples)
+        if example.strip().partition("\n")[0] in _COMPACT_EXAMPLES
+    ]
+    return re.sub(r"\n\s*\n+", "\n", preamble + heading + "\n".join(kept) + closing + tail)
+
+
+_MODIFY_ITEM_COMPACT_INSTRUCTIONS = _compact_instructions(_MODIFY_ITEM_INSTRUCTIONS)
+
+
+def get_modify_item_messages(
+    user_input: str,
+    current_order: List[Dict[str, Any]],
+    conversation_history: ConversationHistory,
+    command_history: ConversationHistory,
+    prompt_mode: Literal["full", "compact"] = "full"
+) -> List[BaseMessage]:
+    """
+    Build the modify item prompt as a static system message and a per-request user message
+    
+    Args:
+        user_input: User's modification request
+        current_order: Current order items with details
+        conversation_history: Recent conversation turns
+        command_history: Recent commands executed
+        prompt_mode: "compact" keeps only the split and clarification examples, skips a command
+            history that is the same object as the conversation history and
+            collapses blank lines, to cut input tokens
+        
+    Returns:
+        [SystemMessage, HumanMessage] ready for LangChain
+    """
+    instructions = _MODIFY_ITEM_COMPACT_INSTRUCTIONS if prompt_mode == "compact" else _MODIFY_ITEM_INSTRUCTIONS
+    context = _get_context(user_input, current_order, conversation_history, command_history, prompt_mode)
+    return [
+        SystemMessage(content=instructions),
+        HumanMessage(content=context)
+    ]
+
+
+def get_modify_item_prompt(
+    user_input: str,
+    current_order: List[Dict[str, Any]],
+    conversation_history: ConversationHistory,
+    command_history: ConversationHistory,
+    prompt_mode: Literal["full", "compact"] = "full"
+) -> str:
+    """
+    Build the prompt for LLM item modification parsing as a single string
+    
+    Same content as get_modify_item_messages, with the static instructions
+    followed by the per-request context.
     
-    # Create PromptTemplate with input variables
-    prompt_template = PromptTemplate(
-        template=template,
-        input_variables=["user_input", "order_context", "conversation_context", "command_context"]
-    )
+    Returns:
+        Formatted prompt string ready for LangChain
+    """
+    instructions = _MODIFY_ITEM_COMPACT_INSTRUCTIONS if prompt_mode == "compact" else _MODIFY_ITEM_INSTRUCTIONS
+    context = _get_context(user_input, current_order, conversation_history, command_history, prompt_mode)
+    return f"{instructions}\n{context}"
+
+
+def _get_context(
+    user_input: str,
+    current_order: List[Dict[str, Any]],
+    conversation_history: ConversationHistory,
+    command_history: ConversationHistory,
+    prompt_mode: Literal["full", "compact"]
+) -> str:
+    """Render the per-request context block"""
+    order_context = _format_order_context(current_order)
+    conversation_context = _format_conversation_context(conversation_history)
+    
+    # Compact mode doesn't repeat a command history that is the conversation history
+    if prompt_mode == "compact" and command_history is conversation_history:
+        command_context = "Same as conversation history"
+    else:
+        command_context = _format_command_context(command_history)
+    
+    context = f"""CONTEXT:
+Current Order:
+{order_context}
+
+Conversation History:
+{conversation_context}
+
+Command History:
+{command_context}
+
+USER INPUT: "{user_input}"
+"""
     
-    # Format the template with actual values
-    return prompt_template.format(
-        user_input=user_input,
-        order_context=order_context,
-        conversation_context=conversation_context,
-        command_context=command_context
-    )
+    if prompt_mode == "compact":
+        return re.sub(r"\n\s*\n+", "\n", context)
+    return context
 
 
 def _format_order_context(current_order: List[Dict[str, Any]]) -> str:
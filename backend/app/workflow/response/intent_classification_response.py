@@ -3,7 +3,7 @@ Pydantic models for Intent Classification Agent responses
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from app.constants.intent_types import IntentType
 
 
@@ -40,3 +40,10 @@ class IntentClassificationResult(BaseModel):
         return self.intent != IntentType.UNKNOWN and self.confidence >= 0.6
 
 
+class IntentClassificationBatchResult(BaseModel):
+    """
+    Response from the Intent Classification Agent for several inputs at once
+    """
+    results: List[IntentClassificationResult] = Field(
+        ..., description="One classification per user input, in input order"
+    )
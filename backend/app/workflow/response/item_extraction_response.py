@@ -67,3 +67,9 @@ class ItemExtractionResponse(BaseModel):
         """Get items with low confidence (< 0.8)"""
         return [item for item in self.extracted_items if item.confidence < 0.8]
 
+
+class ItemExtractionBatchResponse(BaseModel):
+    """
+    Response from Item Extraction Agent for several inputs at once
+    """
+    results: List[ItemExtractionResponse] = Field(description="One extraction per user input, in input order")
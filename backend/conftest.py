@@ -0,0 +1,64 @@
+"""
+Root pytest configuration
+
+Loaded before command line parsing, so options registered here work from the
+backend directory (app/tests/conftest.py is only picked up during collection).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+def pytest_addoption(parser):
+    """Register custom command line options"""
+    parser.addoption(
+        "--yappi",
+        action="store_true",
+        default=False,
+        help="Profile with yappi (wall clock) instead of cProfile when using pytest-profiling"
+    )
+
+
+class YappiProfile:
+    """
+    Drop-in replacement for cProfile.Profile backed by yappi.
+
+    cProfile only sees the event loop thread, so async tests show up as time
+    spent in the selector. yappi in wall-clock mode attributes awaits to the
+    coroutines that made them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        import yappi
+        self._yappi = yappi
+
+    def enable(self):
+        self._yappi.set_clock_type("wall")
+        self._yappi.start()
+
+    def disable(self):
+        self._yappi.stop()
+
+    def dump_stats(self, path):
+        self._yappi.get_func_stats().save(path, type="pstat")
+        self._yappi.clear_stats()
+
+
+def pytest_configure(config):
+    """
+    Swap in the yappi profiler for pytest-profiling when --yappi is given.
+
+    Only pytest-profiling's reference to cProfile is replaced, so the stdlib
+    module stays untouched for anything else in the process.
+
+    Example:
+        pytest --yappi --profile-svg -k "confirm_order_with_items_success"
+    """
+    if not config.getoption("--yappi"):
+        return
+    try:
+        import pytest_profiling
+    except ImportError:
+        raise pytest.UsageError("--yappi needs pytest-profiling")
+    pytest_profiling.cProfile = SimpleNamespace(Profile=YappiProfile)
@@ -0,0 +1,234 @@
+"""
+Script to prebake the integration test LLM cache through the OpenAI Batch API
+
+Collects the structured agent requests the integration tests will make:
+- every item_extraction_agent(...) call in the item extraction tests whose
+  arguments are literals
+- every modify_item_agent call the modify service scenarios make up front
+  (app/tests/integration/_modify_item_scenarios.py, the same requests their
+  agent_result_cache fixture gathers)
+
+submits them as one batch job (billed at half the synchronous rate), waits for
+it to finish, and writes the structured results into the disk cache that the
+tests replay from.
+
+Calls whose arguments come from fixtures or variables are skipped; the tests
+fill those in on their first live run as usual.
+"""
+
+import ast
+import asyncio
+import io
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Add the app directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
+from app.config.settings import settings
+from app.dto.conversation_dto import ConversationHistory
+from app.workflow.prompts.item_extraction_prompts import build_item_extraction_prompt
+from app.workflow.prompts.modify_item_prompts import get_modify_item_messages
+from app.workflow.response.item_extraction_response import ItemExtractionResponse
+from app.workflow.response.modify_item_response import ModifyItemResult
+from app.tests.fixtures.llm_cache_keys import CACHE_DIR, DETERMINISTIC_LLM_OPTIONS, structured_cache_path
+from app.tests.integration._modify_item_scenarios import agent_requests
+from app.workflow.agents.item_extraction_agent import _MODEL as ITEM_EXTRACTION_MODEL
+from app.workflow.agents.modify_item_agent import _MODEL as MODIFY_ITEM_MODEL
+
+TEST_FILE = Path(__file__).parent.parent / "app" / "tests" / "integration" / "test_item_extraction_agent_integration.py"
+
+# Chat roles for LangChain message types
+_ROLES = {"system": "system", "human": "user"}
+
+POLL_INTERVAL_SECONDS = int(os.getenv("PREBAKE_POLL_INTERVAL", "60"))
+
+
+def _module_constants(tree: ast.Module) -> dict:
+    """Module-level NAME = <literal> and NAME = MappingProxyType(<literal>) assignments"""
+    constants = {}
+    for node in tree.body:
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)):
+            continue
+        value = node.value
+        if isinstance(value, ast.Call) and getattr(value.func, "id", None) == "MappingProxyType" and len(value.args) == 1:
+            value = value.args[0]
+        try:
+            constants[node.targets[0].id] = ast.literal_eval(value)
+        except ValueError:
+            pass
+    return constants
+
+
+def _argument_value(node: ast.expr, constants: dict):
+    """Evaluate a literal argument, or a name bound to a literal module constant"""
+    if isinstance(node, ast.Name) and node.id in constants:
+        return constants[node.id]
+    return ast.literal_eval(node)
+
+
+def find_literal_calls(path: Path) -> list:
+    """Return (user_input, context) for each item_extraction_agent call with literal arguments"""
+    tree = ast.parse(path.read_text())
+    constants = _module_constants(tree)
+    calls = []
+    skipped = 0
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and getattr(node.func, "id", None) == "item_extraction_agent"):
+            continue
+        try:
+            kwargs = {keyword.arg: _argument_value(keyword.value, constants) for keyword in node.keywords}
+            calls.append((kwargs["user_input"], kwargs["context"]))
+        except (ValueError, KeyError):
+            skipped += 1
+    print(f"📋 Found {len(calls)} literal calls ({skipped} skipped)")
+    return calls
+
+
+def item_extraction_requests() -> list:
+    """(model, prompt, schema) for each literal item_extraction_agent call in the item extraction tests"""
+    return [
+        (
+            ITEM_EXTRACTION_MODEL,
+            build_item_extraction_prompt(
+                user_input,
+                context.get("conversation_history", []),
+                context.get("order_state", {}),
+                context.get("restaurant_id", "1")
+            ),
+            ItemExtractionResponse
+        )
+        for user_input, context in find_literal_calls(TEST_FILE)
+    ]
+
+
+def modify_service_requests() -> list:
+    """(model, messages, schema) for each modify_item_agent call the modify service scenarios make"""
+    requests = [
+        (
+            MODIFY_ITEM_MODEL,
+            get_modify_item_messages(
+                user_input=user_input,
+                current_order=current_order,
+                conversation_history=conversation_history,
+                # The agent's default when no command history is passed
+                command_history=ConversationHistory(session_id="")
+            ),
+            ModifyItemResult
+        )
+        for user_input, (current_order, conversation_history) in agent_requests().items()
+    ]
+    print(f"📋 Found {len(requests)} modify service scenarios")
+    return requests
+
+
+def _openai_messages(prompt) -> list:
+    """Chat completion messages for a prompt string or LangChain message list"""
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return [{"role": _ROLES[message.type], "content": message.content} for message in prompt]
+
+
+def build_batch_file(requests: list) -> bytes:
+    """One /v1/chat/completions request per (model, prompt, schema), forcing the same tool call the agent makes"""
+    lines = []
+    for i, (model, prompt, schema) in enumerate(requests):
+        tool = convert_to_openai_tool(schema)
+        lines.append(json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                **DETERMINISTIC_LLM_OPTIONS,
+                "messages": _openai_messages(prompt),
+                "tools": [tool],
+                "tool_choice": {"type": "function", "function": {"name": tool["function"]["name"]}},
+                "parallel_tool_calls": False
+            }
+        }))
+    return "\n".join(lines).encode()
+
+
+@lru_cache(maxsize=None)
+def _keyed_llm(model: str) -> ChatOpenAI:
+    """Chat model carrying the agent's model name and sampling settings, which are part of the cache key"""
+    return ChatOpenAI(model=model, api_key=settings.openai_api_key, **DETERMINISTIC_LLM_OPTIONS)
+
+
+def _cache_path(model: str, prompt, schema) -> Path:
+    """Where the tests look up the structured result for this request"""
+    return structured_cache_path(_keyed_llm(model), schema, prompt)
+
+
+async def wait_for_batch(client: AsyncOpenAI, batch_id: str):
+    """Poll until the batch reaches a terminal state"""
+    while True:
+        batch = await client.batches.retrieve(batch_id)
+        print(f"⏳ Batch {batch_id}: {batch.status} ({batch.request_counts.completed}/{batch.request_counts.total})")
+        if batch.status in ("completed", "failed", "expired", "cancelled"):
+            return batch
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+
+async def prebake_llm_fixtures():
+    """Submit every cacheable prompt as one batch and store the results"""
+    # The same request can appear more than once (e.g. a smoke fixture and its test)
+    requests = list({
+        _cache_path(model, prompt, schema): (model, prompt, schema)
+        for model, prompt, schema in item_extraction_requests() + modify_service_requests()
+    }.values())
+    if not requests:
+        print("ℹ️  Nothing to prebake")
+        return
+
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    batch_file = await client.files.create(file=("prebake.jsonl", io.BytesIO(build_batch_file(requests))), purpose="batch")
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"🚀 Submitted batch {batch.id} with {len(requests)} requests")
+
+    batch = await wait_for_batch(client, batch.id)
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} finished as {batch.status}")
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    output = await client.files.content(batch.output_file_id)
+    stored = 0
+    for line in output.text.splitlines():
+        record = json.loads(line)
+        response = record["response"]
+        if response["status_code"] != 200:
+            print(f"❌ Request {record['custom_id']} failed: {response['body']}")
+            continue
+        arguments = response["body"]["choices"][0]["message"]["tool_calls"][0]["function"]["arguments"]
+        model, prompt, schema = requests[int(record["custom_id"])]
+        result = schema.model_validate_json(arguments)
+        _cache_path(model, prompt, schema).write_text(result.model_dump_json())
+        stored += 1
+
+    print(f"✅ Stored {stored} results in {CACHE_DIR}")
+
+
+async def main():
+    """Main function to prebake the LLM cache"""
+    print("🚀 Starting LLM fixture prebake...")
+    await prebake_llm_fixtures()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())